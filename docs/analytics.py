@@ -0,0 +1,328 @@
+# Tournament-history analytics for the "Tournament History" screen ("View completed tournaments and stats")
+# Works on the column blobs of an archive.py file (mmap views, nothing is decoded into dicts). One build pass
+# precomputes three player-keyed tables with CSR offsets, so every query is a slice plus a binary search:
+#   head-to-head  - per (player, opponent) pair: sets and games won and lost
+#   formats       - per player and tournament format: sets and games won and lost
+#   placements    - per (player, tournament): final place and field size, in tournament (archive) order
+# Elimination events place players by the round they went out in (2 + players eliminated later, like
+# simulator.py); round robin and Swiss events rank by sets won.
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from archive import Archive, ArchiveWriter
+from bracket_generator import COMPLETED, Bracket, BracketGenerator
+from scoring import ScoringEngine, simulate_games
+from stats import FORMATS
+
+ELIMINATION = (FORMATS.index("single_elim"), FORMATS.index("double_elim"))
+CHAMPION = np.iinfo(np.int64).max
+
+
+def _offsets(owners, size):
+    # CSR offsets for rows already grouped by owner
+    return np.searchsorted(owners, np.arange(size + 1))
+
+
+def _rate(won, lost):
+    played = won + lost
+    return won / played if played else 0.0
+
+
+class HistoryAnalytics:
+    def __init__(self, archive):
+        self.archive = archive
+        self.players = len(archive.column("players.id"))
+        self.tournaments = len(archive.column("tournaments.id"))
+        self._tournament_index = None
+        self.timings = {}
+        for name, build in (("head_to_head", self._build_head_to_head), ("formats", self._build_formats),
+                            ("placements", self._build_placements)):
+            start = time.perf_counter()
+            build()
+            self.timings[name] = time.perf_counter() - start
+
+    # Build
+
+    def _completed(self):
+        # Completed matches between two players: (row, player1, player2, player1 won)
+        a = self.archive
+        p1, p2 = a.column("matches.player1"), a.column("matches.player2")
+        rows = np.flatnonzero((a.column("matches.status") == COMPLETED) & (p1 >= 0) & (p2 >= 0))
+        p1, p2 = p1[rows], p2[rows]
+        return rows, p1, p2, a.column("matches.winner")[rows] == p1
+
+    def _build_head_to_head(self):
+        # Each match counted from both sides, then summed per (player, opponent) key
+        a = self.archive
+        rows, p1, p2, first = self._completed()
+        s1 = a.column("matches.player1_score")[rows].astype(np.int32)
+        s2 = a.column("matches.player2_score")[rows].astype(np.int32)
+        player = np.concatenate([p1, p2]).astype(np.int64)
+        keys, inverse = np.unique(player * self.players + np.concatenate([p2, p1]), return_inverse=True)
+        won = np.concatenate([first, ~first])
+        self.h2h_opponent = (keys % self.players).astype(np.int32)
+        self.h2h_offsets = _offsets(keys // self.players, self.players)
+        self.h2h_sets_won = np.bincount(inverse, weights=won, minlength=len(keys)).astype(np.int32)
+        self.h2h_sets_lost = np.bincount(inverse, weights=~won, minlength=len(keys)).astype(np.int32)
+        self.h2h_games_won = np.bincount(inverse, weights=np.concatenate([s1, s2]), minlength=len(keys)).astype(np.int32)
+        self.h2h_games_lost = np.bincount(inverse, weights=np.concatenate([s2, s1]), minlength=len(keys)).astype(np.int32)
+
+    def _build_formats(self):
+        # [player, format] totals, straight from the head-to-head inputs
+        a = self.archive
+        rows, p1, p2, first = self._completed()
+        fmt = a.column("tournaments.format")[a.column("matches.tournament")[rows]].astype(np.int64)
+        s1 = a.column("matches.player1_score")[rows]
+        s2 = a.column("matches.player2_score")[rows]
+        size = self.players * len(FORMATS)
+        cell1 = p1.astype(np.int64) * len(FORMATS) + fmt
+        cell2 = p2.astype(np.int64) * len(FORMATS) + fmt
+
+        def total(w1, w2):
+            both = np.bincount(cell1, weights=w1, minlength=size) + np.bincount(cell2, weights=w2, minlength=size)
+            return both.astype(np.int64).reshape(self.players, len(FORMATS))
+
+        self.format_sets_won = total(first, ~first)
+        self.format_sets_lost = total(~first, first)
+        self.format_games_won = total(s1, s2)
+        self.format_games_lost = total(s2, s1)
+
+    def _build_placements(self):
+        a = self.archive
+        status = a.column("matches.status")
+        tournament_of = a.column("matches.tournament")
+        # Only events whose matches are all completed have final placements
+        unfinished = np.bincount(tournament_of, weights=status != COMPLETED, minlength=self.tournaments)
+        finished = unfinished == 0
+
+        # Every (tournament, player, match row) appearance, grouped per entry in match order
+        p1, p2 = a.column("matches.player1"), a.column("matches.player2")
+        rows = np.concatenate([np.flatnonzero(p1 >= 0), np.flatnonzero(p2 >= 0)])
+        player = np.concatenate([p1[p1 >= 0], p2[p2 >= 0]]).astype(np.int64)
+        tournament = tournament_of[rows].astype(np.int64)
+        keep = finished[tournament]
+        rows, player, tournament = rows[keep], player[keep], tournament[keep]
+        if not len(rows):
+            # No finished event (or an empty archive): empty standings and placement histories
+            empty = np.zeros(0, dtype=np.int32)
+            self.standing_player = self.standing_place = empty
+            self.placement_tournament = self.placement_place = self.placement_entrants = empty
+            self.standing_offsets = _offsets(empty, self.tournaments)
+            self.placement_offsets = _offsets(empty, self.players)
+            return
+        order = np.lexsort((rows, player, tournament))
+        rows, player, tournament = rows[order], player[order], tournament[order]
+        won = a.column("matches.winner")[rows] == player
+        starts = np.flatnonzero(np.concatenate([[True], (player[1:] != player[:-1]) | (tournament[1:] != tournament[:-1])]))
+        last = np.append(starts[1:], len(rows)) - 1
+        entry_player, entry_tournament = player[starts], tournament[starts]
+
+        # Score: higher finishes better. Elimination: the (section, round) of the last match, or CHAMPION
+        # for a player who won their last match; otherwise sets won in the event.
+        section_round = (a.column("matches.bracket")[rows[last]].astype(np.int64) * 1024
+                         + a.column("matches.round")[rows[last]])
+        eliminated_format = np.isin(a.column("tournaments.format")[entry_tournament], ELIMINATION)
+        score = np.where(won[last], CHAMPION, section_round)
+        score = np.where(eliminated_format, score, np.add.reduceat(won.astype(np.int64), starts))
+
+        # Place = 1 + entries of the same event with a strictly higher score
+        ranked = np.lexsort((-score, entry_tournament))
+        t, s = entry_tournament[ranked], score[ranked]
+        new_block = np.concatenate([[True], (t[1:] != t[:-1]) | (s[1:] != s[:-1])])
+        block_start = np.maximum.accumulate(np.where(new_block, np.arange(len(t)), 0))
+        event_start = np.searchsorted(t, t)
+        place = np.empty(len(t), dtype=np.int32)
+        place[ranked] = block_start - event_start + 1
+        entrants = np.bincount(entry_tournament, minlength=self.tournaments)
+
+        # Per event, best place first (standings) and per player, in archive order (history)
+        self.standing_player = entry_player[ranked].astype(np.int32)
+        self.standing_place = place[ranked]
+        self.standing_offsets = _offsets(t, self.tournaments)
+        by_player = np.lexsort((entry_tournament, entry_player))
+        self.placement_tournament = entry_tournament[by_player].astype(np.int32)
+        self.placement_place = place[by_player]
+        self.placement_entrants = entrants[entry_tournament[by_player]].astype(np.int32)
+        self.placement_offsets = _offsets(entry_player[by_player], self.players)
+
+    # Lookups
+
+    def _player(self, player_id):
+        index = self.archive.player_index(player_id)
+        if index is None:
+            raise KeyError(f"Unknown player {player_id!r}")
+        return index
+
+    def _player_id(self, index):
+        return self.archive.string(self.archive.column("players.id")[index])
+
+    def _tournament(self, tournament_id):
+        if self._tournament_index is None:
+            ids = self.archive.strings(self.archive.column("tournaments.id"))
+            self._tournament_index = {tid: i for i, tid in enumerate(ids)}
+        if tournament_id not in self._tournament_index:
+            raise KeyError(f"Unknown tournament {tournament_id!r}")
+        return self._tournament_index[tournament_id]
+
+    # Queries
+
+    def head_to_head(self, player_id, opponent_id):
+        a, b = self._player(player_id), self._player(opponent_id)
+        lo, hi = self.h2h_offsets[a], self.h2h_offsets[a + 1]
+        k = lo + np.searchsorted(self.h2h_opponent[lo:hi], b)
+        if k == hi or self.h2h_opponent[k] != b:
+            return {"sets_won": 0, "sets_lost": 0, "games_won": 0, "games_lost": 0}
+        return {"sets_won": int(self.h2h_sets_won[k]), "sets_lost": int(self.h2h_sets_lost[k]),
+                "games_won": int(self.h2h_games_won[k]), "games_lost": int(self.h2h_games_lost[k])}
+
+    def rivals(self, player_id, k=10):
+        # Most played opponents: (opponent id, sets won, sets lost)
+        a = self._player(player_id)
+        lo, hi = self.h2h_offsets[a], self.h2h_offsets[a + 1]
+        won, lost = self.h2h_sets_won[lo:hi], self.h2h_sets_lost[lo:hi]
+        played = won.astype(np.int64) + lost
+        top = np.argsort(-played, kind="stable")[:k]
+        return [(self._player_id(self.h2h_opponent[lo + i]), int(won[i]), int(lost[i])) for i in top.tolist()]
+
+    def matrix(self, player_ids):
+        # Sets won by row player against column player, for a chosen group (e.g. a top 32)
+        players = np.array([self._player(pid) for pid in player_ids], dtype=np.int32)
+        order = np.argsort(players)
+        result = np.zeros((len(players), len(players)), dtype=np.int32)
+        for i, a in enumerate(players.tolist()):
+            lo, hi = self.h2h_offsets[a], self.h2h_offsets[a + 1]
+            opponents = self.h2h_opponent[lo:hi]
+            k = np.minimum(np.searchsorted(opponents, players[order]), max(hi - lo - 1, 0))
+            hit = (opponents[k] == players[order]) if hi > lo else np.zeros(len(players), dtype=bool)
+            result[i, order[hit]] = self.h2h_sets_won[lo + k[hit]]
+        return result
+
+    def format_win_rates(self, player_id):
+        a = self._player(player_id)
+        rates = {}
+        for f, name in enumerate(FORMATS):
+            won, lost = int(self.format_sets_won[a, f]), int(self.format_sets_lost[a, f])
+            if won + lost:
+                games_won, games_lost = int(self.format_games_won[a, f]), int(self.format_games_lost[a, f])
+                rates[name] = {"sets": won + lost, "set_win_rate": _rate(won, lost),
+                               "game_win_rate": _rate(games_won, games_lost)}
+        return rates
+
+    def top_players(self, k=10, format=None, min_sets=20):
+        # Best set win rates among players with at least `min_sets` sets (in `format`, if given)
+        columns = slice(None) if format is None else FORMATS.index(format)
+        won = self.format_sets_won[:, columns]
+        lost = self.format_sets_lost[:, columns]
+        if format is None:
+            won, lost = won.sum(axis=1), lost.sum(axis=1)
+        played = won + lost
+        rate = np.where(played >= min_sets, won / np.maximum(played, 1), -1.0)
+        k = min(k, int((rate >= 0).sum()))
+        if not k:
+            return []
+        best = np.argpartition(-rate, k - 1)[:k]
+        best = best[np.lexsort((-played[best], -rate[best]))]
+        return [(self._player_id(i), float(rate[i]), int(played[i])) for i in best.tolist()]
+
+    def placements(self, player_id):
+        # Every finished event the player entered, oldest first
+        a = self._player(player_id)
+        lo, hi = self.placement_offsets[a], self.placement_offsets[a + 1]
+        tournaments = self.placement_tournament[lo:hi]
+        ids = self.archive.strings(self.archive.column("tournaments.id")[tournaments])
+        formats = self.archive.column("tournaments.format")[tournaments].tolist()
+        return [{"tournament_id": tid, "format": FORMATS[fmt], "place": place, "entrants": entrants}
+                for tid, fmt, place, entrants in zip(ids, formats, self.placement_place[lo:hi].tolist(),
+                                                     self.placement_entrants[lo:hi].tolist())]
+
+    def standings(self, tournament_id, k=8):
+        t = self._tournament(tournament_id)
+        lo = self.standing_offsets[t]
+        hi = min(self.standing_offsets[t + 1], lo + k)
+        return [(self._player_id(p), place) for p, place in
+                zip(self.standing_player[lo:hi].tolist(), self.standing_place[lo:hi].tolist())]
+
+    def player_summary(self, player_id):
+        a = self._player(player_id)
+        lo, hi = self.placement_offsets[a], self.placement_offsets[a + 1]
+        won, lost = int(self.format_sets_won[a].sum()), int(self.format_sets_lost[a].sum())
+        return {"events": int(hi - lo), "best_place": int(self.placement_place[lo:hi].min()) if hi > lo else None,
+                "sets_won": won, "sets_lost": lost, "set_win_rate": _rate(won, lost),
+                "game_win_rate": _rate(int(self.format_games_won[a].sum()), int(self.format_games_lost[a].sum()))}
+
+
+def synthetic_history(path, games=10000000, players=20000, seed=5):
+    # Archive of finished events until `games` games are recorded; each event replays one of a few
+    # simulated result sets with a freshly drawn field
+    rng = np.random.default_rng(seed)
+    shapes = []
+    for generate, size in ((lambda p: BracketGenerator.generateDoubleElimination(p, seed=1), 1024),
+                           (lambda p: BracketGenerator.generateSingleElimination(p, seed=1), 1024),
+                           (BracketGenerator.generateRoundRobin, 64)):
+        for _ in range(4):
+            played = generate(list(range(size)))
+            engine = ScoringEngine(played)
+            simulate_games(played, engine, rng)
+            shapes.append((played, size, engine.games_by_match()))
+    ids = np.array([f"player-{i:05d}" for i in range(players)], dtype=object)
+    recorded = events = 0
+    with ArchiveWriter(path) as writer:
+        writer.add_players({"id": pid, "name": f"Player {i}"} for i, pid in enumerate(ids.tolist()))
+        while recorded < games:
+            played, size, by_match = shapes[events % len(shapes)]
+            field = ids[rng.choice(players, size, replace=False)]
+            bracket = Bracket(played.format, field.tolist(), played.matches, played.rounds)
+            writer.add_tournament({"id": f"event-{events:05d}", "name": f"Event {events}", "status": "completed"},
+                                  bracket, {match: field[winners].tolist() for match, winners in by_match.items()})
+            recorded += sum(len(w) for w in by_match.values())
+            events += 1
+    return events, recorded
+
+
+if __name__ == "__main__":
+    print("SmashScore Tournament History Analytics")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "history.ssa")
+        start = time.perf_counter()
+        events, games = synthetic_history(path)
+        print(f"Archive: {events} events, {games} games, {os.path.getsize(path) / 2 ** 20:.0f} MiB "
+              f"(written in {time.perf_counter() - start:.1f} s)")
+
+        archive = Archive(path)
+        analytics = HistoryAnalytics(archive)
+        print(f"Precomputed over {len(archive)} matches: "
+              + ", ".join(f"{name} {seconds:.2f} s" for name, seconds in analytics.timings.items()))
+
+        rng = np.random.default_rng(1)
+        sample = [f"player-{i:05d}" for i in rng.integers(0, analytics.players, 200).tolist()]
+        top = [pid for pid, _, _ in analytics.top_players(32)]
+        queries = (
+            ("head_to_head", lambda i: analytics.head_to_head(sample[i], sample[-1 - i])),
+            ("rivals", lambda i: analytics.rivals(sample[i])),
+            ("format_win_rates", lambda i: analytics.format_win_rates(sample[i])),
+            ("placements", lambda i: analytics.placements(sample[i])),
+            ("player_summary", lambda i: analytics.player_summary(sample[i])),
+            ("standings", lambda i: analytics.standings(f"event-{i * 7 % events:05d}")),
+            ("top_players", lambda i: analytics.top_players(10, format=FORMATS[i % 3])),
+            ("matrix (top 32)", lambda i: analytics.matrix(top)),
+        )
+        for name, query in queries:
+            times = []
+            for i in range(len(sample)):
+                start = time.perf_counter()
+                query(i)
+                times.append(time.perf_counter() - start)
+            print(f"  • {name:18} median {statistics.median(times) * 1000:.3f} ms, max {max(times) * 1000:.2f} ms")
+
+        player = analytics.top_players(1)[0][0]
+        print(f"\n{player}: {analytics.player_summary(player)}")
+        print(f"  by format: {analytics.format_win_rates(player)}")
+        print(f"  rivals: {analytics.rivals(player, 3)}")
+        print(f"  event-00000 standings: {analytics.standings('event-00000', 4)}")
+        del analytics
+        archive.close()
@@ -0,0 +1,298 @@
+# Binary columnar archive for tournament history (players, tournaments, matches, games)
+# Layout: 16-byte header (magic, directory offset), 64-byte aligned little-endian column blobs, JSON directory.
+# Every id and name is interned into one string table (offsets + UTF-8 bytes); tables reference strings and
+# players by integer index. Players are sorted by id so lookups bisect the string table, and a CSR index
+# (player -> match rows) lets "all matches of player X" gather only its own rows out of the mmap.
+import json
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from bracket_generator import BRACKET_NAMES, STATUS_NAMES, Bracket, BracketGenerator
+from stats import FORMATS, Interner
+
+MAGIC = b"SSARCHV1"
+HEADER = struct.Struct("<8sQ")
+ALIGN = 64
+NONE = -1
+
+TOURNAMENT_STATUSES = ("setup", "active", "completed")
+MATCH_FORMATS = ("bo3", "bo5")
+
+# table.column -> dtype; everything is stored little-endian
+SCHEMA = {
+    "players.id": "<i4", "players.name": "<i4", "players.tag": "<i4",
+    "tournaments.id": "<i4", "tournaments.name": "<i4", "tournaments.format": "<i1",
+    "tournaments.match_format": "<i1", "tournaments.status": "<i1", "tournaments.matches": "<i8",
+    "matches.tournament": "<i4", "matches.match_no": "<i4", "matches.player1": "<i4", "matches.player2": "<i4",
+    "matches.player1_score": "<i1", "matches.player2_score": "<i1", "matches.winner": "<i4",
+    "matches.status": "<i1", "matches.round": "<i2", "matches.bracket": "<i1", "matches.position": "<i4",
+    "matches.games": "<i8",
+    "games.match": "<i8", "games.winner": "<i4",
+    "player_matches.offsets": "<i8", "player_matches.rows": "<i8",
+    "strings.offsets": "<i8", "strings.data": "u1",
+}
+
+
+def _code(values, name):
+    return values.index(name) if name in values else NONE
+
+
+class ArchiveWriter:
+    # Collects players and brackets column-wise, then writes the archive in one pass on close()
+    def __init__(self, path):
+        self.path = path
+        self.strings = Interner()
+        self.players = Interner()  # external player id -> provisional index (remapped to sorted order)
+        self.player_names = {}
+        self.tournaments = {name: [] for name in SCHEMA if name.startswith("tournaments.")}
+        self.matches = {name: [] for name in SCHEMA if name.startswith("matches.")}
+        self.games_match = []
+        self.games_winner = []
+        self.match_count = 0
+        self.game_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+
+    def add_players(self, players):
+        for p in players:
+            self.players.intern(p["id"])
+            self.player_names[p["id"]] = (p.get("name") or p["id"], p.get("tag") or None)
+
+    def add_tournament(self, tournament, bracket, games=None):
+        # games: optional {match_no: [winner player id per game]} for the Bo3/Bo5 game results
+        ids = [p["id"] if isinstance(p, dict) else p for p in bracket.players]
+        local = np.append(self.players.intern_many(ids), NONE).astype(np.int32)  # BYE (-1) maps to NONE
+        m = bracket.matches
+        n = len(m)
+        t = self.tournaments
+        t["tournaments.id"].append(self.strings.intern(tournament["id"]))
+        t["tournaments.name"].append(self.strings.intern(tournament.get("name", tournament["id"])))
+        t["tournaments.format"].append(_code(FORMATS, tournament.get("format") or bracket.format))
+        t["tournaments.match_format"].append(_code(MATCH_FORMATS, tournament.get("match_format", "bo3")))
+        t["tournaments.status"].append(_code(TOURNAMENT_STATUSES, tournament.get("status", "active")))
+        t["tournaments.matches"].append(self.match_count)
+
+        c = self.matches
+        c["matches.tournament"].append(np.full(n, len(t["tournaments.id"]) - 1, dtype=np.int32))
+        c["matches.match_no"].append(np.arange(n, dtype=np.int32))
+        c["matches.player1"].append(local[m.player1])
+        c["matches.player2"].append(local[m.player2])
+        c["matches.winner"].append(local[m.winner])
+        for name in ("player1_score", "player2_score", "status", "round", "bracket", "position"):
+            c["matches." + name].append(getattr(m, name).copy())  # a snapshot, like the player columns above
+
+        counts = np.zeros(n, dtype=np.int64)
+        for match_no, winners in sorted((games or {}).items()):  # offsets below are in match_no order
+            counts[match_no] = len(winners)
+            self.games_match.append(np.full(len(winners), self.match_count + match_no, dtype=np.int64))
+            self.games_winner.append(self.players.intern_many(winners).astype(np.int32))
+        c["matches.games"].append(self.game_count + np.cumsum(counts) - counts)
+        self.game_count += int(counts.sum())
+        self.match_count += n
+
+    def _columns(self):
+        # Final column arrays, with players sorted by id and every player reference remapped
+        player_ids = self.players.values
+        order = np.array(sorted(range(len(player_ids)), key=lambda i: player_ids[i].encode()), dtype=np.int64)
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        remap = np.append(rank, NONE)  # index -1 (NONE) stays NONE
+
+        columns = {}
+        names = [self.player_names.get(player_ids[i], (player_ids[i], None)) for i in order.tolist()]
+        columns["players.id"] = np.array([self.strings.intern(player_ids[i]) for i in order.tolist()], dtype=np.int32)
+        columns["players.name"] = np.array([self.strings.intern(name) for name, _ in names], dtype=np.int32)
+        columns["players.tag"] = np.array([NONE if tag is None else self.strings.intern(tag) for _, tag in names],
+                                          dtype=np.int32)
+        for name, values in self.tournaments.items():
+            columns[name] = np.array(values, dtype=SCHEMA[name])
+        columns["tournaments.matches"] = np.append(columns["tournaments.matches"], self.match_count)
+        for name, chunks in self.matches.items():
+            columns[name] = np.concatenate(chunks).astype(SCHEMA[name]) if chunks else np.zeros(0, SCHEMA[name])
+        for name in ("matches.player1", "matches.player2", "matches.winner"):
+            columns[name] = remap[columns[name]]
+        columns["matches.games"] = np.append(columns["matches.games"], self.game_count)
+        columns["games.match"] = np.concatenate(self.games_match) if self.games_match else np.zeros(0, np.int64)
+        columns["games.winner"] = remap[np.concatenate(self.games_winner)] if self.games_winner else np.zeros(0, np.int32)
+
+        # CSR index: rows of every match a player appears in, grouped by player, in match order
+        p1, p2 = columns["matches.player1"], columns["matches.player2"]
+        rows = np.concatenate([np.flatnonzero(p1 >= 0), np.flatnonzero(p2 >= 0)])
+        owners = np.concatenate([p1[p1 >= 0], p2[p2 >= 0]])
+        order = np.lexsort((rows, owners))
+        counts = np.bincount(owners, minlength=len(player_ids))
+        columns["player_matches.offsets"] = np.concatenate([[0], np.cumsum(counts)])
+        columns["player_matches.rows"] = rows[order]
+
+        encoded = [s.encode("utf-8") for s in self.strings.values]
+        columns["strings.offsets"] = np.concatenate([[0], np.cumsum([len(s) for s in encoded], dtype=np.int64)])
+        columns["strings.data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return columns
+
+    def close(self):
+        columns = self._columns()
+        directory = {}
+        temp = self.path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, 0))
+            for name, column in columns.items():
+                column = np.ascontiguousarray(column, dtype=SCHEMA[name])
+                f.write(b"\0" * (-f.tell() % ALIGN))
+                directory[name] = [SCHEMA[name], f.tell(), len(column)]
+                f.write(column.tobytes())
+            offset = f.tell()
+            f.write(json.dumps({"columns": directory, "version": 1}).encode())
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, offset))
+        os.replace(temp, self.path)
+
+
+class Archive:
+    # Read side: columns are zero-copy views into a read-only mmap of the file
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, offset = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a tournament archive: {path}")
+        self.directory = json.loads(self.map[offset:])["columns"]
+        self._columns = {}
+
+    def close(self):
+        self._columns.clear()
+        try:
+            self.map.close()
+        except BufferError:
+            pass  # arrays handed out still view the mapping; it is released together with them
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def column(self, name):
+        if name not in self._columns:
+            dtype, offset, count = self.directory[name]
+            self._columns[name] = np.frombuffer(self.map, dtype=dtype, count=count, offset=offset)
+        return self._columns[name]
+
+    def __len__(self):
+        return self.directory["matches.tournament"][2]
+
+    def string(self, index):
+        if index < 0:
+            return None
+        offsets = self.column("strings.offsets")
+        return self.column("strings.data")[offsets[index]:offsets[index + 1]].tobytes().decode("utf-8")
+
+    def strings(self, indices):
+        return [self.string(i) for i in np.asarray(indices).tolist()]
+
+    def player_index(self, player_id):
+        # Binary search over the sorted players.id column, decoding O(log n) strings
+        ids = self.column("players.id")
+        target = player_id.encode("utf-8")
+        offsets, data = self.column("strings.offsets"), self.column("strings.data")
+        lo, hi = 0, len(ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            s = ids[mid]
+            if data[offsets[s]:offsets[s + 1]].tobytes() < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(ids) and self.string(ids[lo]) == player_id:
+            return lo
+        return None
+
+    def player_match_rows(self, player_id):
+        index = self.player_index(player_id)
+        if index is None:
+            return np.zeros(0, dtype=np.int64)
+        offsets = self.column("player_matches.offsets")
+        return self.column("player_matches.rows")[offsets[index]:offsets[index + 1]]
+
+    def match_columns(self, rows, names=None):
+        # Gather only the requested rows (touching only the pages they sit on) of the match columns
+        names = names or [n.split(".", 1)[1] for n in SCHEMA if n.startswith("matches.") and n != "matches.games"]
+        return {name: self.column("matches." + name)[rows] for name in names}
+
+    def games(self, row):
+        starts = self.column("matches.games")
+        return self.column("games.winner")[starts[row]:starts[row + 1]]
+
+    def match_records(self, rows):
+        # Rows as Match-shaped dicts (the data_models layout), for export or display
+        c = self.match_columns(rows)
+        player_ids = self.column("players.id")
+        tournament_ids = self.column("tournaments.id")
+
+        def player(i):
+            return None if i == NONE else self.string(player_ids[i])
+
+        records = []
+        for k, row in enumerate(np.asarray(rows).tolist()):
+            rnd, section = int(c["round"][k]), int(c["bracket"][k])
+            records.append({
+                "id": row,
+                "tournament_id": self.string(tournament_ids[c["tournament"][k]]),
+                "player1_id": player(c["player1"][k]),
+                "player2_id": player(c["player2"][k]),
+                "player1_score": int(c["player1_score"][k]),
+                "player2_score": int(c["player2_score"][k]),
+                "winner_id": player(c["winner"][k]),
+                "games": [player(w) for w in self.games(row).tolist()],
+                "status": STATUS_NAMES[c["status"][k]],
+                "round": rnd,
+                "bracket_position": f"{BRACKET_NAMES[section]}-{rnd}-{int(c['position'][k])}",
+            })
+        return records
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("SmashScore Tournament Archive")
+    print("=" * 60)
+    rng = np.random.default_rng(3)
+    players, size, entrants = 200000, 10000000, 1024
+    template = BracketGenerator.generateDoubleElimination(list(range(entrants)))
+    per_event = len(template.matches)
+    events = -(-size // per_event)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "history.ssa")
+        start = time.perf_counter()
+        with ArchiveWriter(path) as writer:
+            writer.add_players({"id": f"player-{i:06d}", "name": f"Player {i}"} for i in range(players))
+            for event in range(events):
+                entrants_ids = [f"player-{i:06d}" for i in rng.choice(players, entrants, replace=False).tolist()]
+                bracket = Bracket("double_elim", entrants_ids, template.matches, template.rounds)
+                writer.add_tournament({"id": f"event-{event}", "name": f"Weekly #{event}"}, bracket)
+        written = time.perf_counter() - start
+        total = os.path.getsize(path)
+        print(f"Wrote {events * per_event} matches from {events} events in {written:.1f} s: {total / 2 ** 20:.0f} MiB")
+
+        start = time.perf_counter()
+        archive = Archive(path)
+        opened = time.perf_counter() - start
+        start = time.perf_counter()
+        rows = archive.player_match_rows("player-012345")
+        columns = archive.match_columns(rows)
+        elapsed = time.perf_counter() - start
+        touched = sum(len(np.unique(rows * np.dtype(SCHEMA["matches." + n]).itemsize // mmap.PAGESIZE))
+                      for n in columns) * mmap.PAGESIZE
+        print(f"Opened in {opened * 1000:.2f} ms; player-012345: {len(rows)} matches in {elapsed * 1000:.2f} ms, "
+              f"~{touched / 2 ** 20:.1f} MiB of pages touched ({touched / total:.2%} of the file)")
+        print(archive.match_records(rows[:1])[0])
+        del rows, columns
+        archive.close()
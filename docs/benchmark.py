@@ -0,0 +1,247 @@
+# Benchmark harness for bracket generation, seeding, pairing and scoring
+# Covers every format in app_structure["tournament_formats"] and every BracketGenerator method at 8 .. 65,536
+# players. Each (format, size) case runs in a fresh worker process; every stage reports best/median wall
+# time, peak RSS while it ran (VmHWM, reset through /proc/self/clear_refs) and peak traced allocations.
+# Results are written as JSON and compared against a baseline file; slowdowns over --threshold are flagged.
+# The checked-in baseline is benchmark_baseline.json (its "meta" says which machine recorded it); timings only
+# compare on similar hardware, so re-record it there with `--output benchmark_baseline.json` when needed.
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+import seeding
+import swiss
+from bracket_generator import BracketGenerator
+from scaffold import format_id
+from scoring import ScoringEngine, simulate_games
+from script import app_structure
+
+SIZES = [1 << k for k in range(3, 17)]
+# Largest field per format that still finishes in seconds (a round robin of n has n(n-1)/2 matches)
+SIZE_LIMITS = {"round_robin": 1024}
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+MIN_TIME = 0.2           # short stages repeat past `repeat` runs until this much time is spent ...
+MAX_RUNS = 50            # ... or this many runs
+MIN_RUNS = 3             # times from fewer runs than this (on either side) are not compared
+MIN_DELTA_SECONDS = 2e-3  # ignore slowdowns smaller than this, whatever the ratio: sub-ms stages jitter ~2x
+MIN_DELTA_BYTES = 1 << 20
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # lifetime peak, KiB on Linux
+
+
+def _players(n):
+    return list(range(n))
+
+
+def _played(generate, n):
+    # A bracket plus the full game log of one simulated event, for the scoring stages
+    bracket = generate(_players(n))
+    engine = ScoringEngine(bracket)
+    simulate_games(bracket, engine, np.random.default_rng(n))
+    return engine.game_match, engine.game_winner
+
+
+def _swiss_after_round(n):
+    state = BracketGenerator.generateSwiss(_players(n))
+    ids = np.asarray(swiss.pair_round(state))
+    m = state.matches
+    winners = np.where(m.player2[ids] < 0, m.player1[ids], np.maximum(m.player1[ids], m.player2[ids]))
+    swiss.record_round(state, ids, winners)
+    return state
+
+
+def stages(format, n):
+    # (stage, setup, run): setup is untimed and its result is passed to run
+    single = lambda p: BracketGenerator.generateSingleElimination(p, seed=1)
+    double = lambda p: BracketGenerator.generateDoubleElimination(p, seed=1)
+    ratings = np.random.default_rng(0).normal(1500, 200, n)
+    seeding_stages = [
+        ("seed_random", lambda: None, lambda _: seeding.seed_lines(n, seed=1)),
+        ("seed_rating", lambda: None, lambda _: seeding.seed_lines(n, mode="rating", ratings=ratings)),
+    ]
+
+    def scoring_stages(generate):
+        log = {}
+
+        def fresh():
+            bracket = generate(_players(n))
+            if not log:
+                log["games"] = _played(generate, n)
+            return bracket
+
+        return [
+            ("score_live", fresh, lambda b: _replay_live(b, *log["games"])),
+            ("score_ingest", fresh, lambda b: ScoringEngine(b).ingest(*log["games"])),
+        ]
+
+    if format == "single_elim":
+        return [("generate", lambda: None, lambda _: single(_players(n)))] + seeding_stages + scoring_stages(single)
+    if format == "double_elim":
+        return ([("generate", lambda: None, lambda _: double(_players(n))),
+                 ("losers_bracket", lambda: None, lambda _: BracketGenerator.generateLosersBracket(n))]
+                + seeding_stages + scoring_stages(double))
+    if format == "round_robin":
+        generate = BracketGenerator.generateRoundRobin
+        return [("generate", lambda: None, lambda _: generate(_players(n)))] + scoring_stages(generate)
+    if format == "swiss":
+        return [("generate", lambda: None, lambda _: BracketGenerator.generateSwiss(_players(n))),
+                ("pair_first", lambda: BracketGenerator.generateSwiss(_players(n)), swiss.pair_round),
+                ("pair_second", lambda: _swiss_after_round(n), swiss.pair_round)]
+    raise ValueError(f"Unknown tournament format: {format}")
+
+
+def _replay_live(bracket, game_matches, game_winners):
+    engine = ScoringEngine(bracket)
+    for match_id, winner in zip(game_matches, game_winners):
+        engine.record_game(match_id, winner)
+
+
+def measure(setup, run, repeat):
+    times = []
+    peak_rss = 0
+    spent = 0.0
+    while len(times) < max(repeat, 1) or (spent < MIN_TIME and len(times) < MAX_RUNS):
+        state = setup()
+        _reset_peak_rss()
+        start = time.perf_counter()
+        run(state)
+        elapsed = time.perf_counter() - start
+        peak_rss = max(peak_rss, _peak_rss())
+        times.append(elapsed)
+        spent += elapsed
+    # Allocation peak in a separate traced run, since tracing slows allocation-heavy code
+    state = setup()
+    tracemalloc.start()
+    run(state)
+    alloc_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": min(times), "median": statistics.median(times), "runs": len(times),
+            "peak_rss": peak_rss, "alloc_peak": alloc_peak}
+
+
+def run_case(format, n, repeat):
+    results = []
+    for stage, setup, run in stages(format, n):
+        results.append({"format": format, "size": n, "stage": stage, **measure(setup, run, repeat)})
+    return results
+
+
+def formats():
+    return [format_id(fmt["name"]) for fmt in app_structure["tournament_formats"]]
+
+
+def run_all(selected, sizes, repeat=5):
+    cases = [(f, n) for f in selected for n in sizes if n <= SIZE_LIMITS.get(f, n)]
+    results = []
+    # One process per case so every case starts from the same clean heap
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for (format, n), case in zip(cases, pool.map(run_case, *zip(*cases), [repeat] * len(cases))):
+            results.extend(case)
+            slowest = max(case, key=lambda r: r["seconds"])
+            print(f"  • {format:12} {n:6}: {len(case)} stages, slowest {slowest['stage']} "
+                  f"{slowest['seconds'] * 1000:.2f} ms", file=sys.stderr)
+    return results
+
+
+def metadata():
+    return {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+            "machine": platform.machine(), "cpus": os.cpu_count(),
+            "timestamp": datetime.now(timezone.utc).isoformat()}
+
+
+def compare(results, baseline, threshold):
+    # Rows present in both runs, with time and allocation ratios; `regression` marks flagged rows. Time is only
+    # judged when both sides have MIN_RUNS runs and the slowdown is above the noise floor.
+    base = {(r["format"], r["size"], r["stage"]): r for r in baseline["results"]}
+    rows = []
+    for r in results:
+        b = base.get((r["format"], r["size"], r["stage"]))
+        if b is None:
+            continue
+        time_ratio = r["seconds"] / max(b["seconds"], 1e-9)
+        alloc_ratio = r["alloc_peak"] / max(b["alloc_peak"], 1)
+        timed = min(r["runs"], b.get("runs", 0)) >= MIN_RUNS
+        slower = timed and time_ratio > 1 + threshold and r["seconds"] - b["seconds"] > MIN_DELTA_SECONDS
+        bigger = alloc_ratio > 1 + threshold and r["alloc_peak"] - b["alloc_peak"] > MIN_DELTA_BYTES
+        rows.append({"format": r["format"], "size": r["size"], "stage": r["stage"], "time_ratio": time_ratio,
+                     "alloc_ratio": alloc_ratio, "regression": slower or bigger})
+    return rows
+
+
+def print_table(results, comparison=None):
+    ratios = {(c["format"], c["size"], c["stage"]): c for c in comparison or []}
+    print(f"{'format':12} {'size':>6} {'stage':14} {'best ms':>10} {'median ms':>10} {'peak RSS':>9} {'allocs':>9}"
+          + ("  vs baseline" if comparison else ""))
+    for r in results:
+        line = (f"{r['format']:12} {r['size']:6} {r['stage']:14} {r['seconds'] * 1000:10.2f} "
+                f"{r['median'] * 1000:10.2f} {r['peak_rss'] / 2 ** 20:7.0f}Mi {r['alloc_peak'] / 2 ** 20:7.1f}Mi")
+        c = ratios.get((r["format"], r["size"], r["stage"]))
+        if c:
+            line += f"  x{c['time_ratio']:.2f} time, x{c['alloc_ratio']:.2f} alloc" + ("  REGRESSION" if c["regression"] else "")
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SmashScore bracket benchmarks")
+    parser.add_argument("--formats", nargs="+", default=formats(), choices=formats())
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--max-size", type=int, default=None, help="drop sizes above this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=BASELINE if os.path.exists(BASELINE) else None,
+                        help="results file to compare against (default: the checked-in benchmark_baseline.json)")
+    parser.add_argument("--no-baseline", dest="baseline", action="store_const", const=None,
+                        help="skip the comparison")
+    parser.add_argument("--threshold", type=float, default=0.2, help="flag slowdowns above this fraction")
+    args = parser.parse_args(argv)
+
+    sizes = [n for n in args.sizes if args.max_size is None or n <= args.max_size]
+    results = run_all(args.formats, sizes, args.repeat)
+    with open(args.output, "w") as f:
+        json.dump({"meta": metadata(), "results": results}, f, indent=1)
+
+    comparison = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            comparison = compare(results, json.load(f), args.threshold)
+    print_table(results, comparison)
+    print(f"\nResults written to {args.output}")
+    regressions = [c for c in comparison or [] if c["regression"]]
+    if regressions:
+        print(f"{len(regressions)} regressions above {args.threshold:.0%}:")
+        for c in regressions:
+            print(f"  • {c['format']} {c['size']} {c['stage']}: x{c['time_ratio']:.2f} time, x{c['alloc_ratio']:.2f} alloc")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
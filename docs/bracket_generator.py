@@ -0,0 +1,340 @@
+# Python bracket engine with the same surface as the BracketGenerator.js template in script_1.py
+# Matches are stored column-wise (one NumPy array per field) and referenced by integer ids
+import math
+import time
+
+import numpy as np
+
+import instrument
+import round_robin
+import seeding
+
+# Empty player slot (bye) and missing match link
+BYE = -1
+NO_MATCH = -1
+
+# Match status codes, in the order of Match.status in the data models
+PENDING, ACTIVE, COMPLETED = 0, 1, 2
+STATUS_NAMES = ("pending", "active", "completed")
+
+# Bracket sections used by double elimination
+WINNERS, LOSERS, GRAND_FINAL = 0, 1, 2
+BRACKET_NAMES = ("winners", "losers", "grand_final")
+
+
+class MatchTable:
+    # Column name -> (dtype, fill value); a match id is simply its row index
+    columns = {
+        "player1": (np.int32, BYE),
+        "player2": (np.int32, BYE),
+        "player1_score": (np.int8, 0),
+        "player2_score": (np.int8, 0),
+        "winner": (np.int32, BYE),
+        "round": (np.int16, 0),
+        "position": (np.int32, 0),
+        "bracket": (np.int8, WINNERS),
+        "status": (np.int8, PENDING),
+        "prev_match1": (np.int32, NO_MATCH),
+        "prev_match2": (np.int32, NO_MATCH),
+        "next_match": (np.int32, NO_MATCH),
+        "next_slot": (np.int8, 0),
+        "loser_match": (np.int32, NO_MATCH),
+        "loser_slot": (np.int8, 0),
+        # Players this match will actually receive; a match expecting one is a bye and completes on arrival
+        "entrants": (np.int8, 2),
+    }
+
+    def __init__(self, size=0):
+        for name, (dtype, fill) in self.columns.items():
+            setattr(self, name, np.full(size, fill, dtype=dtype))
+
+    def __len__(self):
+        return len(self.player1)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.columns)
+
+    def grow(self, extra):
+        # Append `extra` default rows and return the range of new match ids
+        start = len(self)
+        for name, (dtype, fill) in self.columns.items():
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, np.full(extra, fill, dtype=dtype)]))
+        return range(start, start + extra)
+
+    def match(self, match_id):
+        # Single match as a plain dict, shaped like the objects in the JS template
+        row = {name: getattr(self, name)[match_id].item() for name in self.columns}
+        row["id"] = match_id
+        row["status"] = STATUS_NAMES[row["status"]]
+        row["bracket"] = BRACKET_NAMES[row["bracket"]]
+        return row
+
+
+class Bracket:
+    def __init__(self, format, players, matches, rounds):
+        self.format = format
+        self.players = list(players)
+        self.matches = matches
+        self.rounds = rounds
+
+    def player(self, player_id):
+        return None if player_id < 0 else self.players[player_id]
+
+    def round_matches(self, round, bracket=WINNERS):
+        m = self.matches
+        return np.flatnonzero((m.round == round) & (m.bracket == bracket))
+
+    @instrument.traced("bracket.record_result")
+    def record_result(self, match_id, winner):
+        # Complete a match and route winner and loser through the precomputed tables, O(1) per result
+        m = self.matches
+        if m.status[match_id] == COMPLETED:
+            raise ValueError(f"Match {match_id} is already decided")
+        p1, p2 = m.player1[match_id], m.player2[match_id]
+        if p1 == BYE or p2 == BYE:
+            raise ValueError(f"Match {match_id} is still waiting for its players")
+        if winner != p1 and winner != p2:
+            raise ValueError(f"Player {winner} is not playing match {match_id}")
+        loser = p2 if winner == p1 else p1
+        m.winner[match_id] = winner
+        m.status[match_id] = COMPLETED
+        next_match = m.next_match[match_id]
+        if m.bracket[match_id] == GRAND_FINAL and m.round[match_id] == 1 and winner == p1:
+            # Winners bracket champion took the grand final, so the reset is never played
+            m.winner[next_match] = winner
+            m.status[next_match] = COMPLETED
+            return NO_MATCH
+        self._place(next_match, m.next_slot[match_id], winner)
+        self._place(m.loser_match[match_id], m.loser_slot[match_id], loser)
+        return next_match
+
+    def _place(self, match_id, slot, player):
+        m = self.matches
+        if match_id == NO_MATCH or player == BYE:
+            return
+        (m.player1 if slot == 0 else m.player2)[match_id] = player
+        if m.entrants[match_id] == 1:
+            m.winner[match_id] = player
+            m.status[match_id] = COMPLETED
+            self._place(m.next_match[match_id], m.next_slot[match_id], player)
+
+    def to_dict(self):
+        # {round: [match, ...]} with player ids resolved, like the template's bracket object;
+        # double elimination is split into winners/losers/grandFinal like generateDoubleElimination
+        sections = {}
+        for match_id in range(len(self.matches)):
+            match = self.matches.match(match_id)
+            for key in ("player1", "player2", "winner"):
+                match[key] = self.player(match[key])
+            sections.setdefault(match["bracket"], {}).setdefault(match["round"], []).append(match)
+        if self.format != "double_elim":
+            return sections.get("winners", {})
+        grand_final = sections.get("grand_final", {})
+        return {
+            "winners": sections.get("winners", {}),
+            "losers": sections.get("losers", {}),
+            "grandFinal": grand_final.get(1, [None])[0],
+            "resetMatch": grand_final.get(2, [None])[0],
+        }
+
+
+class SwissState:
+    def __init__(self, players, rounds):
+        n = len(players)
+        self.players = list(players)
+        self.rounds = rounds
+        self.current_round = 1
+        self.points = np.zeros(n, dtype=np.int32)
+        self.byes = np.zeros(n, dtype=np.int16)
+        # opponents[p, r] is the player met in round r + 1 (BYE if none yet)
+        self.opponents = np.full((n, rounds), BYE, dtype=np.int32)
+        self.matches = MatchTable()
+
+
+def _link(table, sources, targets, slots, column="next"):
+    # Point each source match at (target, slot) through the next_* or loser_* columns
+    getattr(table, column + "_match")[sources] = targets
+    getattr(table, column + "_slot")[sources] = slots
+
+
+def _losers_layout(table, slots, start=0):
+    # Losers bracket for a winners bracket of `slots`: 2 * (k - 1) rounds, where odd rounds pair
+    # survivors and even rounds take the players dropping from winners round (t / 2) + 1
+    k = slots.bit_length() - 1
+    rounds = 2 * (k - 1)
+    counts = slots >> ((np.arange(1, rounds + 1) + 1) // 2 + 1)
+    offsets = start + np.concatenate(([0], np.cumsum(counts)))
+    table.round[start:offsets[-1]] = np.repeat(np.arange(1, rounds + 1), counts)
+    table.bracket[start:offsets[-1]] = LOSERS
+    for t in range(1, rounds + 1):
+        ids = np.arange(offsets[t - 1], offsets[t])
+        table.position[ids] = ids - offsets[t - 1] + 1
+        if t == rounds:
+            continue
+        local = ids - offsets[t - 1]
+        if t % 2:
+            _link(table, ids, offsets[t] + local, 1)
+        else:
+            _link(table, ids, offsets[t] + local // 2, local & 1)
+    return offsets
+
+
+def _elimination_layout(table, slots, start=0, bracket=WINNERS):
+    # Fill rows start..start+slots-2 with a complete knockout tree; round r begins at slots - (slots >> (r - 1))
+    rounds = slots.bit_length() - 1
+    total = slots - 1
+    offsets = slots - (slots >> np.arange(rounds + 1))
+    rnd = np.repeat(np.arange(1, rounds + 1), slots >> np.arange(1, rounds + 1))
+    pos = np.arange(total) - offsets[rnd - 1]
+    rows = slice(start, start + total)
+
+    table.round[rows] = rnd
+    table.position[rows] = pos + 1
+    table.bracket[rows] = bracket
+    table.next_match[rows] = np.where(rnd < rounds, start + offsets[np.minimum(rnd, rounds)] + pos // 2, NO_MATCH)
+    table.next_slot[rows] = pos & 1
+    later = rnd > 1
+    first_child = start + offsets[rnd[later] - 2] + 2 * pos[later]
+    table.prev_match1[rows][later] = first_child
+    table.prev_match2[rows][later] = first_child + 1
+    return rounds
+
+
+class BracketGenerator:
+    @staticmethod
+    @instrument.traced("bracket.generate_single_elimination")
+    def generateSingleElimination(players, seed=None, lines=None):
+        n = len(players)
+        if n < 2:
+            raise ValueError("At least 2 players are required")
+
+        rounds = math.ceil(math.log2(n))
+        slots = 1 << rounds
+        matches = MatchTable(slots - 1)
+        _elimination_layout(matches, slots)
+        _seed_first_round(matches, seeding.seed_lines(n, seed=seed) if lines is None else lines)
+        return Bracket("single_elim", players, matches, rounds)
+
+    @staticmethod
+    @instrument.traced("bracket.generate_double_elimination")
+    def generateDoubleElimination(players, seed=None, lines=None):
+        n = len(players)
+        if n < 2:
+            raise ValueError("At least 2 players are required")
+
+        rounds = math.ceil(math.log2(n))
+        slots = 1 << rounds
+        matches = MatchTable(2 * slots - 1)
+        _elimination_layout(matches, slots)
+        losers = _losers_layout(matches, slots, start=slots - 1)
+        grand_final, reset = len(matches) - 2, len(matches) - 1
+
+        # Drop-downs: winners round 1 losers fill losers round 1 pairwise, later winners rounds
+        # drop into the even losers rounds, reversed on alternate rounds to delay rematches
+        winners_offsets = slots - (slots >> np.arange(rounds + 1))
+        for r in range(1, rounds + 1):
+            ids = np.arange(winners_offsets[r - 1], winners_offsets[r])
+            local = ids - winners_offsets[r - 1]
+            if rounds == 1:
+                _link(matches, ids, grand_final, 1, "loser")
+            elif r == 1:
+                _link(matches, ids, losers[0] + local // 2, local & 1, "loser")
+            else:
+                drop = local[::-1] if r % 2 == 0 else local
+                _link(matches, ids, losers[2 * (r - 1) - 1] + drop, 0, "loser")
+
+        # Winners final and losers final meet in the grand final; the reset replays it if needed
+        _link(matches, winners_offsets[rounds - 1], grand_final, 0)
+        if rounds > 1:
+            _link(matches, losers[-2], grand_final, 1)
+        _link(matches, grand_final, reset, 0)
+        _link(matches, grand_final, reset, 1, "loser")
+        matches.bracket[grand_final:] = GRAND_FINAL
+        matches.round[grand_final:] = (1, 2)
+        matches.position[grand_final:] = 1
+        _link_previous(matches)
+
+        _seed_first_round(matches, seeding.seed_lines(n, seed=seed) if lines is None else lines)
+        if rounds > 1:
+            # Losers round 1 matches fed by winners byes have fewer entrants
+            first = np.arange(losers[0], losers[1])
+            real = (matches.player2[: slots // 2] != BYE).reshape(-1, 2).sum(axis=1)
+            matches.entrants[first] = real
+            empty = first[real == 0]
+            matches.status[empty] = COMPLETED
+            matches.entrants[matches.next_match[empty]] = 1
+        return Bracket("double_elim", players, matches, rounds)
+
+    @staticmethod
+    @instrument.traced("bracket.generate_losers_bracket")
+    def generateLosersBracket(playerCount):
+        # Standalone losers bracket (local match ids) for a field of playerCount
+        slots = 1 << math.ceil(math.log2(playerCount))
+        losers = MatchTable(max(slots - 2, 0))
+        _losers_layout(losers, slots)
+        return losers
+
+    @staticmethod
+    @instrument.traced("bracket.generate_round_robin")
+    def generateRoundRobin(players):
+        n = len(players)
+        player1, player2 = round_robin.all_pairs(n)
+        matches = MatchTable(len(player1))
+        matches.player1[:] = player1
+        matches.player2[:] = player2
+        matches.round[:] = round_robin.pair_rounds(player1, player2, n) + 1
+        matches.position[:] = np.arange(1, len(player1) + 1)
+        return Bracket("round_robin", players, matches, round_robin.circle_size(n))
+
+    @staticmethod
+    @instrument.traced("bracket.generate_swiss")
+    def generateSwiss(players, rounds=None):
+        if not rounds:
+            rounds = math.ceil(math.log2(len(players)))
+        return SwissState(players, rounds)
+
+
+def _seed_first_round(matches, lines):
+    # Lines 2i and 2i + 1 meet in match i; byes are always on player2, then bye winners advance
+    half = len(lines) // 2
+    matches.player1[:half] = lines[0::2]
+    matches.player2[:half] = lines[1::2]
+
+    bye_matches = np.flatnonzero(matches.player2[:half] == BYE)
+    matches.winner[bye_matches] = matches.player1[bye_matches]
+    matches.status[bye_matches] = COMPLETED
+    matches.entrants[bye_matches] = 1
+    targets = matches.next_match[bye_matches]
+    advance = targets != NO_MATCH
+    into_first = matches.next_slot[bye_matches] == 0
+    matches.player1[targets[advance & into_first]] = matches.player1[bye_matches[advance & into_first]]
+    matches.player2[targets[advance & ~into_first]] = matches.player1[bye_matches[advance & ~into_first]]
+
+
+def _link_previous(matches):
+    # Invert the next/loser tables into prev_match1/prev_match2 so every match knows its feeders
+    matches.prev_match1[:] = NO_MATCH
+    matches.prev_match2[:] = NO_MATCH
+    ids = np.arange(len(matches))
+    for column in ("next", "loser"):
+        targets = getattr(matches, column + "_match")
+        slots = getattr(matches, column + "_slot")
+        linked = targets != NO_MATCH
+        first = linked & (slots == 0)
+        second = linked & (slots == 1)
+        matches.prev_match1[targets[first]] = ids[first]
+        matches.prev_match2[targets[second]] = ids[second]
+
+
+if __name__ == "__main__":
+    print("SmashScore Bracket Engine")
+    print("=" * 60)
+    for generate in (BracketGenerator.generateSingleElimination, BracketGenerator.generateDoubleElimination):
+        for size in (16, 1024, 4096, 16384):
+            start = time.perf_counter()
+            bracket = generate(list(range(size)), seed=1)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"  • {bracket.format}, {size} entrants: {len(bracket.matches)} matches, "
+                  f"{bracket.matches.nbytes / 1024:.0f} KiB, {elapsed:.2f} ms")
@@ -0,0 +1,159 @@
+# SVG renderer for the brackets produced by bracket_generator.py and swiss.py
+# Match boxes are placed in closed form from (bracket, round, position): winners round r spreads its
+# matches 2^(r-1) slots apart, losers rounds halve every second round, grand final and reset sit on the right.
+# Output is one self-contained vector image per tournament, written as plain SVG text.
+import html
+import time
+
+import numpy as np
+
+import instrument
+from bracket_generator import BYE, COMPLETED, GRAND_FINAL, LOSERS, NO_MATCH, WINNERS, BracketGenerator, SwissState
+
+BOX_W, BOX_H = 160, 36
+COL_W = 200
+SLOT_H = 48
+CELL = 18
+MARGIN = 20
+FONT = "font-family='Helvetica, Arial, sans-serif' font-size='11'"
+COLORS = {"box": "#FFFFFF", "border": "#5D878F", "line": "#9AA5B1", "win": "#2E8B57", "loss": "#DB4545",
+          "pending": "#E8ECEF", "text": "#1F2933"}
+
+
+def _svg(width, height, body):
+    return (f"<svg xmlns='http://www.w3.org/2000/svg' width='{width:.0f}' height='{height:.0f}' "
+            f"viewBox='0 0 {width:.0f} {height:.0f}'>"
+            f"<rect width='100%' height='100%' fill='#F7F9FA'/>{''.join(body)}</svg>")
+
+
+def _name(bracket, player):
+    return "" if player == BYE else html.escape(str(bracket.players[player]))
+
+
+def match_positions(bracket):
+    # Top-left corner of every match box, computed from bracket/round/position only
+    m = bracket.matches
+    rounds = bracket.rounds
+    slots = 1 << rounds
+    rnd = m.round.astype(np.float64)
+    pos = m.position.astype(np.float64)
+    x = np.zeros(len(m))
+    y = np.zeros(len(m))
+
+    winners = m.bracket == WINNERS
+    x[winners] = (rnd[winners] - 1) * COL_W
+    y[winners] = (pos[winners] - 0.5) * 2 ** (rnd[winners] - 1) * SLOT_H
+    winners_height = slots // 2 * SLOT_H
+
+    losers = m.bracket == LOSERS
+    losers_top = winners_height + 2 * SLOT_H
+    losers_height = max(slots // 4, 1) * SLOT_H
+    per_round = slots >> ((m.round[losers].astype(np.int64) + 1) // 2 + 1)
+    x[losers] = (rnd[losers] - 1) * COL_W
+    y[losers] = losers_top + (pos[losers] - 0.5) * losers_height / per_round
+
+    final = m.bracket == GRAND_FINAL
+    final_column = max(rounds, 2 * (rounds - 1))
+    x[final] = (final_column + rnd[final] - 1) * COL_W
+    y[final] = winners_height / 2  # level with the winners final
+    return x + MARGIN, y - BOX_H / 2 + MARGIN
+
+
+def _match_box(bracket, match, x, y):
+    m = bracket.matches
+    p1, p2, winner = m.player1[match], m.player2[match], m.winner[match]
+    done = m.status[match] == COMPLETED
+    parts = [f"<rect x='{x:.1f}' y='{y:.1f}' width='{BOX_W}' height='{BOX_H}' rx='4' "
+             f"fill='{COLORS['box']}' stroke='{COLORS['border']}'/>"]
+    for line, (player, score) in enumerate(((p1, m.player1_score[match]), (p2, m.player2_score[match]))):
+        weight = " font-weight='bold'" if done and player == winner and player != BYE else ""
+        ty = y + 14 + line * 16
+        parts.append(f"<text x='{x + 6:.1f}' y='{ty:.1f}' {FONT} fill='{COLORS['text']}'{weight}>"
+                     f"{_name(bracket, player)}</text>")
+        if player != BYE and (done or score):
+            parts.append(f"<text x='{x + BOX_W - 6:.1f}' y='{ty:.1f}' {FONT} text-anchor='end' "
+                         f"fill='{COLORS['text']}'{weight}>{score}</text>")
+    return "".join(parts)
+
+
+def render_elimination(bracket):
+    m = bracket.matches
+    x, y = match_positions(bracket)
+    body = []
+    # Winner connectors: elbow from the right edge of a match to the left edge of its next match
+    source = np.flatnonzero(m.next_match != NO_MATCH)
+    target = m.next_match[source]
+    x1, y1 = x[source] + BOX_W, y[source] + BOX_H / 2
+    x2, y2 = x[target], y[target] + BOX_H / 2
+    xm = (x1 + x2) / 2
+    body.append(f"<path fill='none' stroke='{COLORS['line']}' d='" + "".join(
+        f"M{a:.1f} {b:.1f}H{c:.1f}V{d:.1f}H{e:.1f}" for a, b, c, d, e in zip(x1, y1, xm, y2, x2)) + "'/>")
+    body.extend(_match_box(bracket, i, x[i], y[i]) for i in range(len(m)))
+    return _svg(x.max() + BOX_W + MARGIN, y.max() + BOX_H + MARGIN, body)
+
+
+def render_round_robin(bracket):
+    # Results grid: cell (row, column) is green when the row player beat the column player
+    m = bracket.matches
+    n = len(bracket.players)
+    label = max((len(str(p)) for p in bracket.players), default=0) * 7 + MARGIN
+    done = m.status == COMPLETED
+    colour = np.where(done & (m.winner == m.player1), COLORS["win"], np.where(done, COLORS["loss"], COLORS["pending"]))
+    mirror = np.where(done & (m.winner == m.player1), COLORS["loss"], np.where(done, COLORS["win"], COLORS["pending"]))
+    rows = np.concatenate([m.player1, m.player2])
+    cols = np.concatenate([m.player2, m.player1])
+    fills = np.concatenate([colour, mirror])
+    body = [f"<rect x='{label + c * CELL}' y='{label + r * CELL}' width='{CELL - 1}' height='{CELL - 1}' fill='{f}'/>"
+            for r, c, f in zip(rows.tolist(), cols.tolist(), fills.tolist())]
+    for i, player in enumerate(bracket.players):
+        name = html.escape(str(player))
+        body.append(f"<text x='{label - 4}' y='{label + i * CELL + CELL - 5}' {FONT} text-anchor='end'>{name}</text>")
+        body.append(f"<text transform='translate({label + i * CELL + CELL - 5} {label - 4}) rotate(-90)' {FONT}>{name}</text>")
+    size = label + n * CELL + MARGIN
+    return _svg(size, size, body)
+
+
+def render_swiss(state):
+    # One column per round listing that round's pairings, winners in bold
+    m = state.matches
+    body = []
+    height = 0
+    rounds = int(m.round.max()) if len(m) else 0  # current_round is already past a finished event
+    for r in range(1, rounds + 1):
+        ids = np.flatnonzero(m.round == r)
+        x = MARGIN + (r - 1) * COL_W
+        body.append(f"<text x='{x}' y='{MARGIN}' {FONT} font-weight='bold'>Round {r}</text>")
+        for row, match in enumerate(ids.tolist()):
+            y = MARGIN + 10 + row * (BOX_H + 6)
+            body.append(_match_box(state, match, x, y))
+            height = max(height, y + BOX_H + MARGIN)
+    return _svg(MARGIN * 2 + rounds * COL_W, max(height, 3 * MARGIN), body)
+
+
+@instrument.traced("render.render")
+def render(bracket):
+    if isinstance(bracket, SwissState):
+        return render_swiss(bracket)
+    if bracket.format == "round_robin":
+        return render_round_robin(bracket)
+    return render_elimination(bracket)
+
+
+def write_svg(path, bracket):
+    svg = render(bracket)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(svg)
+    return len(svg)
+
+
+if __name__ == "__main__":
+    print("SmashScore Bracket Renderer")
+    print("=" * 60)
+    for generate, size in ((BracketGenerator.generateSingleElimination, 1024),
+                           (BracketGenerator.generateDoubleElimination, 1024),
+                           (BracketGenerator.generateRoundRobin, 64)):
+        bracket = generate([f"Player {i}" for i in range(size)])
+        start = time.perf_counter()
+        svg = render(bracket)
+        elapsed = time.perf_counter() - start
+        print(f"  • {bracket.format}, {size} entrants: {len(svg) / 1024:.0f} KiB SVG in {elapsed * 1000:.0f} ms")
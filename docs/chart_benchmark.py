@@ -0,0 +1,57 @@
+# Benchmark the batched architecture chart against the original per-row edge loop
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from chart_script import build_figure, layer_colors
+
+
+def synthetic_graph(size, seed=0):
+    # Random tree over the chart layers: every node's parent sits in an earlier row
+    rng = np.random.default_rng(seed)
+    layers = list(layer_colors)
+    parents = np.concatenate([[-1], (rng.random(size - 1) * np.arange(1, size)).astype(int)])
+    names = [f"component-{i}" for i in range(size)]
+    return pd.DataFrame({
+        "component": names,
+        "parent": ["" if p < 0 else names[p] for p in parents],
+        "layer": [layers[i % len(layers)] for i in range(size)],
+        "x": rng.random(size) * 10,
+        "y": rng.random(size) * 10,
+        "size": 10,
+    })
+
+
+def legacy_edges(df):
+    # The loop chart_script.py used before: a DataFrame filter and a trace per edge
+    fig = go.Figure()
+    for _, row in df.iterrows():
+        if row['parent'] and row['parent'] in df['component'].values:
+            parent_row = df[df['component'] == row['parent']].iloc[0]
+            fig.add_trace(go.Scatter(
+                x=[parent_row['x'], row['x']],
+                y=[parent_row['y'], row['y']],
+                mode='lines',
+                line=dict(color='rgba(128,128,128,0.3)', width=1),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+    return fig
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print("Architecture Chart Benchmark")
+    print("=" * 60)
+    for size in (250, 500, 1000, 5000):
+        df = synthetic_graph(size)
+        batched = timed(build_figure, df, layer_colors)
+        legacy = timed(legacy_edges, df)
+        print(f"  • {size} nodes: batched {batched:.3f} s, legacy edge loop {legacy:.3f} s")
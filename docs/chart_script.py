@@ -1,45 +1,47 @@
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
+import numpy as np
+
+from layout import layered_layout
 
 # Define the complete app architecture with all layers
 architecture_data = [
     # Main App Layer
-    {"component": "App.js", "parent": "", "layer": "App Root", "x": 5, "y": 10, "size": 25},
+    {"component": "App.js", "parent": "", "layer": "App Root", "size": 25},
     
     # Main App Components Layer
-    {"component": "Navigation", "parent": "App.js", "layer": "App Components", "x": 2, "y": 8.5, "size": 20},
-    {"component": "AppProvider", "parent": "App.js", "layer": "App Components", "x": 5, "y": 8.5, "size": 20},
-    {"component": "Ad Integration", "parent": "App.js", "layer": "App Components", "x": 8, "y": 8.5, "size": 20},
+    {"component": "Navigation", "parent": "App.js", "layer": "App Components", "size": 20},
+    {"component": "AppProvider", "parent": "App.js", "layer": "App Components", "size": 20},
+    {"component": "Ad Integration", "parent": "App.js", "layer": "App Components", "size": 20},
     
     # Core Screens Layer
-    {"component": "HomeScreen", "parent": "Navigation", "layer": "Screens", "x": 0.5, "y": 7, "size": 15},
-    {"component": "PlayerMgmt", "parent": "Navigation", "layer": "Screens", "x": 1.5, "y": 7, "size": 15},
-    {"component": "TournamentCreate", "parent": "Navigation", "layer": "Screens", "x": 2.5, "y": 7, "size": 15},
-    {"component": "TournamentBracket", "parent": "Navigation", "layer": "Screens", "x": 1, "y": 6, "size": 15},
-    {"component": "MatchDetail", "parent": "Navigation", "layer": "Screens", "x": 2, "y": 6, "size": 15},
-    {"component": "TournamentHist", "parent": "Navigation", "layer": "Screens", "x": 3, "y": 6, "size": 15},
+    {"component": "HomeScreen", "parent": "Navigation", "layer": "Screens", "size": 15},
+    {"component": "PlayerMgmt", "parent": "Navigation", "layer": "Screens", "size": 15},
+    {"component": "TournamentCreate", "parent": "Navigation", "layer": "Screens", "size": 15},
+    {"component": "TournamentBracket", "parent": "Navigation", "layer": "Screens", "size": 15},
+    {"component": "MatchDetail", "parent": "Navigation", "layer": "Screens", "size": 15},
+    {"component": "TournamentHist", "parent": "Navigation", "layer": "Screens", "size": 15},
     
     # Services Layer
-    {"component": "StorageService", "parent": "AppProvider", "layer": "Services", "x": 4, "y": 7, "size": 18},
-    {"component": "TournamentSvc", "parent": "AppProvider", "layer": "Services", "x": 5, "y": 7, "size": 18},
-    {"component": "PlayerService", "parent": "AppProvider", "layer": "Services", "x": 6, "y": 7, "size": 18},
-    {"component": "AdService", "parent": "Ad Integration", "layer": "Services", "x": 8, "y": 7, "size": 18},
+    {"component": "StorageService", "parent": "AppProvider", "layer": "Services", "size": 18},
+    {"component": "TournamentSvc", "parent": "AppProvider", "layer": "Services", "size": 18},
+    {"component": "PlayerService", "parent": "AppProvider", "layer": "Services", "size": 18},
+    {"component": "AdService", "parent": "Ad Integration", "layer": "Services", "size": 18},
     
     # Utils Layer
-    {"component": "BracketGen", "parent": "TournamentSvc", "layer": "Utils", "x": 4.5, "y": 5, "size": 12},
-    {"component": "MatchPairing", "parent": "TournamentSvc", "layer": "Utils", "x": 5.5, "y": 5, "size": 12},
-    {"component": "Helpers", "parent": "StorageService", "layer": "Utils", "x": 4, "y": 4.5, "size": 12},
+    {"component": "BracketGen", "parent": "TournamentSvc", "layer": "Utils", "size": 12},
+    {"component": "MatchPairing", "parent": "TournamentSvc", "layer": "Utils", "size": 12},
+    {"component": "Helpers", "parent": "StorageService", "layer": "Utils", "size": 12},
     
     # Data Models Layer
-    {"component": "Player Model", "parent": "PlayerService", "layer": "Models", "x": 3.5, "y": 3.5, "size": 10},
-    {"component": "Tournament Model", "parent": "TournamentSvc", "layer": "Models", "x": 5, "y": 3.5, "size": 10},
-    {"component": "Match Model", "parent": "TournamentSvc", "layer": "Models", "x": 6.5, "y": 3.5, "size": 10},
+    {"component": "Player Model", "parent": "PlayerService", "layer": "Models", "size": 10},
+    {"component": "Tournament Model", "parent": "TournamentSvc", "layer": "Models", "size": 10},
+    {"component": "Match Model", "parent": "TournamentSvc", "layer": "Models", "size": 10},
     
     # External Dependencies Layer
-    {"component": "React Navigation", "parent": "", "layer": "Dependencies", "x": 1, "y": 2, "size": 12},
-    {"component": "AdMob", "parent": "", "layer": "Dependencies", "x": 5, "y": 2, "size": 12},
-    {"component": "AsyncStorage", "parent": "", "layer": "Dependencies", "x": 9, "y": 2, "size": 12}
+    {"component": "React Navigation", "parent": "", "layer": "Dependencies", "size": 12},
+    {"component": "AdMob", "parent": "", "layer": "Dependencies", "size": 12},
+    {"component": "AsyncStorage", "parent": "", "layer": "Dependencies", "size": 12}
 ]
 
 # Convert to DataFrame for easier manipulation
@@ -56,56 +58,83 @@ layer_colors = {
     "Dependencies": "#964325"
 }
 
-# Create scatter plot with custom styling
-fig = go.Figure()
-
-# Add connections first (so they appear behind nodes)
-for _, row in df.iterrows():
-    if row['parent'] and row['parent'] in df['component'].values:
-        parent_row = df[df['component'] == row['parent']].iloc[0]
-        fig.add_trace(go.Scatter(
-            x=[parent_row['x'], row['x']],
-            y=[parent_row['y'], row['y']],
-            mode='lines',
-            line=dict(color='rgba(128,128,128,0.3)', width=1),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
-
-# Add nodes for each layer
-for layer in layer_colors.keys():
-    layer_data = df[df['layer'] == layer]
-    if not layer_data.empty:
-        fig.add_trace(go.Scatter(
-            x=layer_data['x'],
-            y=layer_data['y'],
-            mode='markers+text',
-            marker=dict(
-                size=layer_data['size'],
-                color=layer_colors[layer],
-                line=dict(width=2, color='white')
-            ),
-            text=layer_data['component'],
-            textposition='middle center',
-            textfont=dict(size=8, color='white'),
-            name=layer,
-            hovertemplate='<b>%{text}</b><br>Layer: ' + layer + '<extra></extra>'
-        ))
-
-# Update layout
-fig.update_layout(
-    title="SmashScore App Architecture",
-    xaxis=dict(showgrid=False, zeroline=False, showticklabels=False, range=[-1, 11]),
-    yaxis=dict(showgrid=False, zeroline=False, showticklabels=False, range=[1, 11]),
-    plot_bgcolor='rgba(0,0,0,0)',
-    legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='center', x=0.5),
-    showlegend=True
-)
-
-# Remove axis lines
-fig.update_xaxes(visible=False)
-fig.update_yaxes(visible=False)
-
-# Save the chart
-fig.write_image("app_architecture.png")
-print("Updated architecture chart saved as app_architecture.png")
\ No newline at end of file
+
+def edge_coordinates(df):
+    # Parent/child line segments as flat x/y arrays with NaN breaks (x0, x1, NaN, ...), so every
+    # edge fits in one trace; parents are resolved through a name -> row index map built once
+    index = pd.Series(np.arange(len(df)), index=df['component'])
+    index = index[~index.index.duplicated()]
+    parents = df['parent'].map(index)
+    has_parent = parents.notna().to_numpy()
+    child = np.flatnonzero(has_parent)
+    parent = parents.to_numpy()[has_parent].astype(np.int64)
+    x, y = df['x'].to_numpy(dtype=float), df['y'].to_numpy(dtype=float)
+    gap = np.full(len(child), np.nan)
+    return (np.column_stack([x[parent], x[child], gap]).ravel(),
+            np.column_stack([y[parent], y[child], gap]).ravel())
+
+
+def build_figure(df, layer_colors):
+    # Components without hand-placed coordinates are positioned by the layered layout engine
+    if 'x' not in df or 'y' not in df:
+        df = df.copy()
+        df['x'], df['y'] = layered_layout(df['component'], df['parent'], df['layer'], list(layer_colors))
+
+    fig = go.Figure()
+
+    # Add connections first (so they appear behind nodes), all edges in a single trace
+    edge_x, edge_y = edge_coordinates(df)
+    fig.add_trace(go.Scatter(
+        x=edge_x,
+        y=edge_y,
+        mode='lines',
+        line=dict(color='rgba(128,128,128,0.3)', width=1),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+
+    # Add nodes, one trace per layer
+    layers = dict(tuple(df.groupby('layer', sort=False)))
+    for layer in layer_colors.keys():
+        layer_data = layers.get(layer)
+        if layer_data is not None:
+            fig.add_trace(go.Scatter(
+                x=layer_data['x'],
+                y=layer_data['y'],
+                mode='markers+text',
+                marker=dict(
+                    size=layer_data['size'],
+                    color=layer_colors[layer],
+                    line=dict(width=2, color='white')
+                ),
+                text=layer_data['component'],
+                textposition='middle center',
+                textfont=dict(size=8, color='white'),
+                name=layer,
+                hovertemplate='<b>%{text}</b><br>Layer: ' + layer + '<extra></extra>'
+            ))
+
+    # Update layout
+    fig.update_layout(
+        title="SmashScore App Architecture",
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False,
+                   range=[df['x'].min() - 1, df['x'].max() + 1]),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False,
+                   range=[df['y'].min() - 1, df['y'].max() + 1]),
+        plot_bgcolor='rgba(0,0,0,0)',
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='center', x=0.5),
+        showlegend=True
+    )
+
+    # Remove axis lines
+    fig.update_xaxes(visible=False)
+    fig.update_yaxes(visible=False)
+    return fig
+
+
+if __name__ == "__main__":
+    fig = build_figure(df, layer_colors)
+
+    # Save the chart
+    fig.write_image("app_architecture.png")
+    print("Updated architecture chart saved as app_architecture.png")
\ No newline at end of file
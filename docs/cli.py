@@ -0,0 +1,245 @@
+# One entry point for the docs tooling: `python cli.py spec|chart|scaffold|profile ...`
+# Only the standard library is imported up front; pandas/plotly/numpy are imported inside the subcommand
+# that needs them, through `lazy_import`, which also records how long each import took (`--timings`).
+# The app_structure spec is compiled once into a pickle keyed by script.py's size and mtime, so the
+# spec and scaffold commands neither re-execute script.py nor import anything heavy.
+import time
+
+START = time.perf_counter()
+
+import argparse
+import importlib
+import os
+import pickle
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SPEC_SOURCE = os.path.join(HERE, "script.py")
+SPEC_CACHE = os.path.join(HERE, ".spec-cache.pickle")
+SPEC_JSON = "smash_tournament_app_structure.json"
+# Default profile sizes; round robin grows with the square of the entrants (10000 would be ~50M matches)
+PROFILE_ENTRANTS = {None: 10000, "round_robin": 500}
+
+timings = []  # (label, seconds)
+
+
+def lazy_import(name):
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    timings.append((f"import {name}", time.perf_counter() - start))
+    return module
+
+
+def _source_key():
+    st = os.stat(SPEC_SOURCE)
+    return st.st_size, st.st_mtime_ns
+
+
+def load_spec():
+    # app_structure from the pickle when it is current, otherwise from script.py (re-pickled)
+    start = time.perf_counter()
+    key = _source_key()
+    try:
+        with open(SPEC_CACHE, "rb") as f:
+            cached_key, spec = pickle.load(f)
+        if cached_key == key:
+            timings.append(("load spec (pickle)", time.perf_counter() - start))
+            return spec
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError):
+        pass
+    spec = lazy_import("script").app_structure
+    from emit import write_atomic
+    write_atomic(SPEC_CACHE, pickle.dumps((key, spec), protocol=pickle.HIGHEST_PROTOCOL))
+    timings.append(("load spec (compiled)", time.perf_counter() - start))
+    return spec
+
+
+def cmd_spec(args):
+    spec = load_spec()
+    if args.json:
+        import json
+        json.dump(spec, sys.stdout, indent=2)
+        print()
+        return
+    overview = lazy_import("overview")
+    overview.print_overview(spec)
+    if args.write:
+        overview.save_structure(spec, args.write)
+
+
+def cmd_chart(args):
+    chart_script = lazy_import("chart_script")
+    start = time.perf_counter()
+    fig = chart_script.build_figure(chart_script.df, chart_script.layer_colors)
+    timings.append(("build figure", time.perf_counter() - start))
+    start = time.perf_counter()
+    if args.output.endswith(".html"):
+        fig.write_html(args.output, include_plotlyjs="cdn")
+    else:
+        fig.write_image(args.output)
+    timings.append(("write " + os.path.splitext(args.output)[1].lstrip("."), time.perf_counter() - start))
+    print(f"Architecture chart saved as {args.output}")
+
+
+def cmd_scaffold(args):
+    scaffold = lazy_import("scaffold")
+    spec_path = args.spec
+    _refresh_spec_json(spec_path)
+    start = time.perf_counter()
+    summary = scaffold.build(spec_path, args.out)
+    timings.append(("build", time.perf_counter() - start))
+    print(f"Rendered {len(summary['rendered'])}, wrote {len(summary['written'])}, "
+          f"unchanged {len(summary['unchanged'])}, removed {len(summary['removed'])}")
+
+
+def _refresh_spec_json(spec_path):
+    # (Re)write the spec JSON from script.py when it is missing or older than script.py. A stamp next to it
+    # records the script.py key it was written from; a JSON without one (other than the default, which
+    # script.py itself writes) was supplied by the user and is left alone.
+    stamp = spec_path + ".source"
+    if os.path.exists(spec_path) and spec_path != SPEC_JSON and not os.path.exists(stamp):
+        return
+    key = list(_source_key())
+    try:
+        with open(stamp, encoding="utf-8") as f:
+            current = f.read() == repr(key)
+    except FileNotFoundError:
+        current = False
+    if current and os.path.exists(spec_path):
+        return
+    lazy_import("overview").save_structure(load_spec(), spec_path)
+    from emit import write_atomic
+    write_atomic(stamp, repr(key).encode("utf-8"))
+
+
+def cmd_profile(args):
+    # Instrumented end-to-end run: generate, score (live and re-ingest), export and render one event
+    os.environ["SMASHSCORE_PROFILE"] = "1"  # before the pipeline modules are imported, so @traced wraps
+    instrument = lazy_import("instrument")
+    np = lazy_import("numpy")
+    bracket_generator = lazy_import("bracket_generator")
+    scoring = lazy_import("scoring")
+    swiss = lazy_import("swiss")
+    export_stream = lazy_import("export_stream")
+    bracket_render = lazy_import("bracket_render")
+
+    import tempfile
+    if args.entrants is None:
+        args.entrants = PROFILE_ENTRANTS.get(args.format, PROFILE_ENTRANTS[None])
+    players = [f"player-{i}" for i in range(args.entrants)]
+    rng = np.random.default_rng(args.seed)
+    rec = instrument.enable()
+    with instrument.span("pipeline", format=args.format, entrants=args.entrants):
+        if args.format == "swiss":
+            state = bracket_generator.BracketGenerator.generateSwiss(players)
+            for _ in range(args.rounds or state.rounds):
+                with instrument.span("swiss.round"):
+                    ids = np.asarray(swiss.pair_round(state))
+                    m = state.matches
+                    ids = ids[m.status[ids] != bracket_generator.COMPLETED]  # byes are already scored
+                    winners = np.where(rng.random(len(ids)) < 0.5, m.player1[ids], m.player2[ids])
+                    swiss.record_round(state, ids, winners)
+            bracket = state
+        else:
+            generate = {"single_elim": bracket_generator.BracketGenerator.generateSingleElimination,
+                        "double_elim": bracket_generator.BracketGenerator.generateDoubleElimination}.get(args.format)
+            bracket = (generate(players, seed=args.seed) if generate
+                       else bracket_generator.BracketGenerator.generateRoundRobin(players))
+            engine = scoring.ScoringEngine(bracket)
+            with instrument.span("scoring.live"):
+                scoring.simulate_games(bracket, engine, rng)
+            replay = scoring.ScoringEngine(type(bracket)(bracket.format, bracket.players,
+                                                         _copy_matches(bracket.matches, engine), bracket.rounds))
+            replay.ingest(engine.game_match, engine.game_winner)
+            with tempfile.TemporaryDirectory() as folder:
+                export_stream.export_tournament(os.path.join(folder, "event.ndjson"),
+                                                {"id": "profile", "name": "Profile run"}, bracket)
+        bracket_render.render(bracket)
+    instrument.disable()
+
+    if args.trace:
+        instrument.write_json(args.trace, instrument.chrome_trace(rec))
+    if args.speedscope:
+        instrument.write_json(args.speedscope, instrument.speedscope(rec))
+    print(instrument.summary(rec))
+    for label, path in (("Chrome trace", args.trace), ("speedscope profile", args.speedscope)):
+        if path:
+            print(f"{label} written to {path}")
+
+
+def _copy_matches(matches, engine):
+    # Fresh table in the seeded state the live engine started from
+    table = type(matches)(len(matches))
+    for name in matches.columns:
+        getattr(table, name)[:] = engine.initial.get(name, getattr(matches, name))
+    return table
+
+
+def import_profile(argv, top=15):
+    # Re-run the command under `python -X importtime` and list the slowest imports (cumulative)
+    import subprocess
+    result = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__)] + argv,
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                rows.append((int(cumulative), name.rstrip()))
+    total = sum(us for us, name in rows if not name.startswith("  "))  # nested imports are indented
+    print(f"Imports: {len(rows)} modules, {total / 1000:.1f} ms at top level")
+    for us, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {us / 1000:8.1f} ms  {name.strip()}")
+    return result.returncode
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="SmashScore docs tooling")
+    parser.add_argument("--timings", action="store_true", help="print startup, import and step timings")
+    parser.add_argument("--importtime", action="store_true", help="profile imports with python -X importtime")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    spec = commands.add_parser("spec", help="print the app_structure overview")
+    spec.add_argument("--json", action="store_true", help="dump the spec as JSON to stdout")
+    spec.add_argument("--write", metavar="PATH", nargs="?", const=SPEC_JSON, help="also save the spec as JSON")
+    spec.set_defaults(run=cmd_spec)
+
+    chart = commands.add_parser("chart", help="render the architecture chart")
+    chart.add_argument("--output", default="app_architecture.png", help="image or .html path")
+    chart.set_defaults(run=cmd_chart)
+
+    scaffold = commands.add_parser("scaffold", help="generate app sources from the spec")
+    scaffold.add_argument("--spec", default=SPEC_JSON, help="spec JSON (written from script.py if missing)")
+    scaffold.add_argument("--out", default="scaffold", help="output folder")
+    scaffold.set_defaults(run=cmd_scaffold)
+
+    profile = commands.add_parser("profile", help="instrumented run of the tournament pipeline")
+    profile.add_argument("--format", default="double_elim",
+                         choices=("single_elim", "double_elim", "round_robin", "swiss"))
+    profile.add_argument("--entrants", type=int, default=None,
+                         help=f"default {PROFILE_ENTRANTS[None]}, or {PROFILE_ENTRANTS['round_robin']} for round robin")
+    profile.add_argument("--rounds", type=int, default=None, help="Swiss rounds to pair (default: all)")
+    profile.add_argument("--seed", type=int, default=1)
+    profile.add_argument("--trace", metavar="PATH", help="write a Chrome trace (chrome://tracing, Perfetto)")
+    profile.add_argument("--speedscope", metavar="PATH", help="write a speedscope profile")
+    profile.set_defaults(run=cmd_profile)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser().parse_args(argv)
+    if args.importtime:
+        return import_profile([a for a in argv if a != "--importtime"])
+    sys.path.insert(0, HERE)
+    ready = time.perf_counter() - START
+    args.run(args)
+    if args.timings:
+        print(f"\nStartup {ready * 1000:.1f} ms, total {(time.perf_counter() - START) * 1000:.1f} ms", file=sys.stderr)
+        for label, seconds in timings:
+            print(f"  {seconds * 1000:8.1f} ms  {label}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
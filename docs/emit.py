@@ -0,0 +1,124 @@
+# Incremental file emission for generated sources (script_1.py and the scaffolding tools)
+# Templates are read from disk only when first used, every output is hashed and skipped when the file
+# on disk already has that content, writes are atomic (temp file + os.replace) and run in a thread pool.
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Mapping
+
+MANIFEST = ".emit-manifest.json"
+TEMPLATE_SUFFIX = ".tmpl"
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+class TemplateStore(Mapping):
+    # filename -> template text, loaded from `folder/<filename>.tmpl` on first access
+    def __init__(self, folder):
+        self.folder = folder
+        self.cache = {}
+
+    def _names(self):
+        return sorted(name[:-len(TEMPLATE_SUFFIX)] for name in os.listdir(self.folder) if name.endswith(TEMPLATE_SUFFIX))
+
+    def __getitem__(self, name):
+        if name not in self.cache:
+            path = os.path.join(self.folder, name + TEMPLATE_SUFFIX)
+            if not os.path.exists(path):
+                raise KeyError(name)
+            with open(path, encoding="utf-8") as f:
+                self.cache[name] = f.read()
+        return self.cache[name]
+
+    def __iter__(self):
+        return iter(self._names())
+
+    def __len__(self):
+        return len(self._names())
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_atomic(path, data):
+    # Write to a temp file in the same directory, then rename over the target
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=folder, prefix=".emit-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(temp, 0o666 & ~UMASK)  # mkstemp creates 0600; match what open() would have given
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _emit_one(root, name, content, previous):
+    # Returns (name, written, manifest record)
+    data = (content() if callable(content) else content).encode("utf-8")
+    digest = content_hash(data)
+    path = os.path.join(root, name)
+    stat = _stat(path)
+    if previous and previous["hash"] == digest and previous["stat"] == stat:
+        return name, False, previous
+    if stat is not None and stat[0] == len(data):
+        with open(path, "rb") as f:
+            if content_hash(f.read()) == digest:
+                return name, False, {"hash": digest, "stat": stat}
+    write_atomic(path, data)
+    return name, True, {"hash": digest, "stat": _stat(path)}
+
+
+def _load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def drifted(names, root="."):
+    # Names whose file is missing or no longer holds what emit last wrote; a matching stat skips the read
+    manifest = _load_manifest(root)
+    result = []
+    for name in names:
+        record = manifest.get(name)
+        path = os.path.join(root, name)
+        stat = _stat(path)
+        if record is None or stat is None:
+            result.append(name)
+        elif stat != record["stat"]:
+            with open(path, "rb") as f:
+                if content_hash(f.read()) != record["hash"]:
+                    result.append(name)
+    return result
+
+
+def emit(outputs, root=".", workers=8):
+    # outputs: filename -> text (or a zero-argument callable producing it); returns (written, skipped)
+    manifest_path = os.path.join(root, MANIFEST)
+    manifest = _load_manifest(root)
+
+    from concurrent.futures import ThreadPoolExecutor  # only needed once something has to be rendered
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda name: _emit_one(root, name, outputs[name], manifest.get(name)), list(outputs)))
+
+    written = [name for name, changed, _ in results if changed]
+    skipped = [name for name, changed, _ in results if not changed]
+    updated = dict(manifest, **{name: record for name, _, record in results})
+    if updated != manifest:
+        write_atomic(manifest_path, json.dumps(updated, indent=1, sort_keys=True).encode("utf-8"))
+    return written, skipped
@@ -0,0 +1,85 @@
+# Batch chart export that keeps one headless renderer warm instead of paying kaleido/Chrome startup per image
+# A single Kaleido browser is opened with `workers` tabs; at most `workers` figures render at once, files are
+# written off the event loop, and every image reports its own latency (from getting a tab to the file on disk)
+# or its own error, so one bad figure does not fail the batch.
+import asyncio
+import os
+import time
+
+
+class ExportPool:
+    def __init__(self, workers=4, timeout=90):
+        self.workers = workers
+        self.timeout = timeout
+        self.renderer = None
+        self.slots = None
+
+    async def __aenter__(self):
+        import kaleido  # optional dependency, only needed once a pool is opened
+
+        self.renderer = kaleido.Kaleido(n=self.workers, timeout=self.timeout)
+        await self.renderer.open()
+        self.slots = asyncio.Semaphore(self.workers)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.renderer.close()
+        self.renderer = None
+
+    async def _render(self, fig, path, width, height, scale):
+        format = os.path.splitext(path)[1].lstrip(".").lower() or "png"
+        opts = {"format": format, "width": width, "height": height, "scale": scale}
+        async with self.slots:
+            start = time.perf_counter()
+            try:
+                data = await self.renderer.calc_fig(fig, {k: v for k, v in opts.items() if v is not None})
+                await asyncio.to_thread(_write_bytes, path, data)
+            except Exception as exc:
+                return {"path": path, "format": format, "error": f"{type(exc).__name__}: {exc}",
+                        "seconds": time.perf_counter() - start}
+        return {"path": path, "format": format, "bytes": len(data), "seconds": time.perf_counter() - start}
+
+    async def export(self, jobs, width=None, height=None, scale=None):
+        # jobs: iterable of (figure, path); the format comes from the path extension (png, svg, ...).
+        # Results are in job order; a failed job has "error" instead of "bytes"
+        tasks = [self._render(fig, path, width, height, scale) for fig, path in jobs]
+        return await asyncio.gather(*tasks)
+
+
+def _write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def export_figures(jobs, workers=4, **options):
+    # Blocking entry point: open the pool, render every job, close the pool
+    async def run():
+        async with ExportPool(workers) as pool:
+            return await pool.export(jobs, **options)
+    return asyncio.run(run())
+
+
+def summarize(results, elapsed):
+    latencies = sorted(r["seconds"] for r in results if "error" not in r)
+    failed = len(results) - len(latencies)
+    if not latencies:
+        return f"No images exported ({failed} failed)" if failed else "No images exported"
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return (f"{len(latencies)} images in {elapsed:.1f} s ({len(latencies) / elapsed:.1f}/s), "
+            f"latency median {latencies[len(latencies) // 2] * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms"
+            + (f", {failed} failed" if failed else ""))
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from chart_script import build_figure, df, layer_colors
+
+    print("SmashScore Chart Export Pool")
+    print("=" * 60)
+    figure = build_figure(df, layer_colors)
+    with tempfile.TemporaryDirectory() as folder:
+        jobs = [(figure, os.path.join(folder, f"architecture_{i}.{'svg' if i % 2 else 'png'}")) for i in range(40)]
+        start = time.perf_counter()
+        results = export_figures(jobs, workers=4)
+        print(summarize(results, time.perf_counter() - start))
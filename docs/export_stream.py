@@ -0,0 +1,144 @@
+# Streaming tournament export: records are produced block by block from the match columns and
+# written as they are encoded, so memory stays flat instead of building the whole document for json.dump
+import json
+import os
+import time
+import tracemalloc
+
+import instrument
+from bracket_generator import BRACKET_NAMES, BYE, STATUS_NAMES, BracketGenerator
+
+BLOCK_SIZE = 4096
+
+
+def player_id(player):
+    return player["id"] if isinstance(player, dict) else player
+
+
+def player_rows(bracket):
+    for player in bracket.players:
+        if isinstance(player, dict):
+            yield player
+        else:
+            yield {"id": player, "name": str(player), "tag": "", "wins": 0, "losses": 0}
+
+
+def match_rows(bracket, tournament_id, block=BLOCK_SIZE):
+    # Match records shaped like app_structure["data_models"]["Match"], converted one block at a time
+    ids = [player_id(p) for p in bracket.players]
+    m = bracket.matches
+    for start in range(0, len(m), block):
+        stop = min(start + block, len(m))
+        columns = zip(
+            range(start, stop),
+            m.player1[start:stop].tolist(), m.player2[start:stop].tolist(),
+            m.player1_score[start:stop].tolist(), m.player2_score[start:stop].tolist(),
+            m.winner[start:stop].tolist(), m.status[start:stop].tolist(),
+            m.round[start:stop].tolist(), m.bracket[start:stop].tolist(), m.position[start:stop].tolist(),
+        )
+        for match_id, p1, p2, s1, s2, winner, status, rnd, section, position in columns:
+            yield {
+                "id": match_id,
+                "tournament_id": tournament_id,
+                "player1_id": None if p1 == BYE else ids[p1],
+                "player2_id": None if p2 == BYE else ids[p2],
+                "player1_score": s1,
+                "player2_score": s2,
+                "winner_id": None if winner == BYE else ids[winner],
+                "games": [],
+                "status": STATUS_NAMES[status],
+                "round": rnd,
+                "bracket_position": f"{BRACKET_NAMES[section]}-{rnd}-{position}",
+            }
+
+
+def tournament_header(tournament, bracket):
+    header = dict(tournament)
+    header.setdefault("format", bracket.format)
+    header["players"] = [player_id(p) for p in bracket.players]
+    return header
+
+
+def _encoder(compact):
+    if compact:
+        return json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+    return json.JSONEncoder(ensure_ascii=False).encode
+
+
+def ndjson_lines(tournament, bracket, compact=True):
+    # One typed record per line: the tournament header, then players, then matches
+    encode = _encoder(compact)
+    yield encode({"type": "tournament", **tournament_header(tournament, bracket)}) + "\n"
+    for player in player_rows(bracket):
+        yield encode({"type": "player", **player}) + "\n"
+    for match in match_rows(bracket, tournament["id"]):
+        yield encode({"type": "match", **match}) + "\n"
+
+
+def json_array(records, encode, indent):
+    # A JSON array emitted element by element
+    separator = ",\n" + indent if indent else ","
+    yield "[" + ("\n" + indent if indent else "")
+    first = True
+    for record in records:
+        if not first:
+            yield separator
+        first = False
+        yield encode(record)
+    yield ("\n" + indent[:-2] if indent else "") + "]"
+
+
+def json_chunks(tournament, bracket, compact=True):
+    # One tournament document with players/matches streamed as chunked arrays
+    encode = _encoder(compact)
+    indent = "" if compact else "    "
+    newline = "" if compact else "\n  "
+    header = tournament_header(tournament, bracket)
+    header.pop("players")
+    yield "{" + newline
+    for key, value in header.items():
+        yield encode(key) + (":" if compact else ": ") + encode(value) + "," + newline
+    yield encode("players") + (":" if compact else ": ")
+    yield from json_array(player_rows(bracket), encode, indent)
+    yield "," + newline + encode("matches") + (":" if compact else ": ")
+    yield from json_array(match_rows(bracket, tournament["id"]), encode, indent)
+    yield ("\n" if not compact else "") + "}\n"
+
+
+def write_stream(path, pieces, buffer_size=1 << 16):
+    # Write generated text through a fixed-size buffer; returns characters written
+    written = 0
+    with open(path, "w", encoding="utf-8", buffering=buffer_size) as f:
+        for piece in pieces:
+            written += f.write(piece)
+    return written
+
+
+@instrument.traced("export.export_tournament")
+def export_tournament(path, tournament, bracket, mode="ndjson", compact=True):
+    pieces = ndjson_lines(tournament, bracket, compact) if mode == "ndjson" else json_chunks(tournament, bracket, compact)
+    return write_stream(path, pieces)
+
+
+if __name__ == "__main__":
+    print("SmashScore Streaming Export")
+    print("=" * 60)
+    for size in (1024, 10240):
+        bracket = BracketGenerator.generateDoubleElimination([f"player-{i}" for i in range(size)], seed=1)
+        tournament = {"id": f"event-{size}", "name": f"Weekly {size}", "match_format": "bo3", "status": "active"}
+        for mode in ("ndjson", "json"):
+            path = f"export_{size}.{mode}"
+            tracemalloc.start()
+            start = time.perf_counter()
+            export_tournament(path, tournament, bracket, mode=mode)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  • {len(bracket.matches)} matches as {mode}: {os.path.getsize(path) / 2**20:.1f} MiB "
+                  f"in {elapsed:.2f} s, peak {peak / 2**20:.2f} MiB")
+            os.remove(path)
+
+    small = BracketGenerator.generateSingleElimination(["a", "b", "c"], seed=1)
+    for compact in (True, False):
+        json.loads("".join(json_chunks({"id": "check"}, small, compact)))
+    print("Chunked JSON output parses as a single document")
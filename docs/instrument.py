@@ -0,0 +1,224 @@
+# Built-in profiling for the tournament pipeline: named spans, counters and histograms
+# Function spans come from @traced, which is resolved once at import time: unless SMASHSCORE_PROFILE=1 is set
+# it returns the function itself, so instrumented code costs nothing in normal runs. With the variable set,
+# wrappers record into the active Recorder (between enable() and disable()). `span`, `count` and `observe`
+# are no-op functions until enable() swaps in the recording ones, so call them as instrument.span(...).
+# Recordings export to Chrome trace JSON (chrome://tracing, Perfetto), speedscope JSON and a summary table.
+import functools
+import json
+import os
+import threading
+import time
+
+ACTIVE = os.environ.get("SMASHSCORE_PROFILE") == "1"
+
+recorder = None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+def _null_span(name, **args):
+    return NULL_SPAN
+
+
+def _null_count(name, value=1):
+    pass
+
+
+def _null_observe(name, value):
+    pass
+
+
+span = _null_span
+count = _null_count
+observe = _null_observe
+
+
+class Recorder:
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.events = []    # (name, thread id, start ns, duration ns, self ns, args)
+        self.counters = {}  # name -> total
+        self.samples = []   # (name, ns, running total) for counter tracks
+        self.histograms = {}
+        self.local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def start(self, name, args):
+        # Stack entries are [name, start, child time, args]
+        self._stack().append([name, time.perf_counter_ns(), 0, args])
+
+    def stop(self):
+        end = time.perf_counter_ns()
+        stack = self._stack()
+        name, start, children, args = stack.pop()
+        duration = max(end - start, 1)  # keeps open/close ordering unambiguous in exports
+        if stack:
+            stack[-1][2] += duration
+        self.events.append((name, threading.get_ident(), start - self.origin, duration, duration - children, args))
+
+    def count(self, name, value=1):
+        total = self.counters.get(name, 0) + value
+        self.counters[name] = total
+        self.samples.append((name, time.perf_counter_ns() - self.origin, total))
+
+    def observe(self, name, value):
+        self.histograms.setdefault(name, []).append(value)
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "args")
+
+    def __init__(self, recorder, name, args):
+        self.recorder, self.name, self.args = recorder, name, args
+
+    def __enter__(self):
+        self.recorder.start(self.name, self.args)
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.stop()
+        return False
+
+
+def _span(name, **args):
+    return _Span(recorder, name, args)
+
+
+def _count(name, value=1):
+    recorder.count(name, value)
+
+
+def _observe(name, value):
+    recorder.observe(name, value)
+
+
+def enable():
+    # Start a fresh recording; returns the Recorder
+    global recorder, span, count, observe
+    recorder = Recorder()
+    span, count, observe = _span, _count, _observe
+    return recorder
+
+
+def disable():
+    # Stop recording; returns the finished Recorder (None if recording was not enabled)
+    global recorder, span, count, observe
+    finished, recorder = recorder, None
+    span, count, observe = _null_span, _null_count, _null_observe
+    return finished
+
+
+def traced(name):
+    # Decorator for a function span; identity unless the process runs with SMASHSCORE_PROFILE=1
+    def decorate(fn):
+        if not ACTIVE:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            active = recorder
+            if active is None:
+                return fn(*args, **kwargs)
+            active.start(name, None)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                active.stop()
+        return wrapper
+    return decorate
+
+
+# Export
+
+def _threads(rec):
+    tids = {}
+    for event in rec.events:
+        tids.setdefault(event[1], len(tids) + 1)
+    return tids
+
+
+def chrome_trace(rec):
+    # Trace Event Format: complete ("X") events per span and counter ("C") events, times in microseconds
+    tids = _threads(rec)
+    events = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": t, "args": {"name": f"thread {t}"}}
+              for t in tids.values()]
+    for name, tid, start, duration, _, args in rec.events:
+        event = {"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": 1, "tid": tids[tid],
+                 "ts": start / 1000, "dur": duration / 1000}
+        if args:
+            event["args"] = args
+        events.append(event)
+    for name, at, total in rec.samples:
+        events.append({"name": name, "ph": "C", "pid": 1, "ts": at / 1000, "args": {"value": total}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def speedscope(rec, name="smashscore"):
+    # Evented profile per thread: open/close events rebuilt from the (properly nested) spans
+    frames = {}
+    profiles = []
+    for tid in _threads(rec):
+        spans = sorted((e for e in rec.events if e[1] == tid), key=lambda e: (e[2], -e[3]))
+        marks = []
+        for span_name, _, start, duration, _, _ in spans:
+            frame = frames.setdefault(span_name, len(frames))
+            marks.append((start, 1, -duration, frame))
+            marks.append((start + duration, 0, duration, frame))
+        marks.sort()  # at equal times closes come first, and inner spans close before outer ones
+        events = [{"type": "O" if kind else "C", "frame": frame, "at": at} for at, kind, _, frame in marks]
+        profiles.append({"type": "evented", "name": f"{name} thread {len(profiles) + 1}", "unit": "nanoseconds",
+                         "startValue": marks[0][0] if marks else 0, "endValue": marks[-1][0] if marks else 0,
+                         "events": events})
+    return {"$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": n} for n in frames]}, "profiles": profiles, "name": name,
+            "exporter": "smashscore-instrument"}
+
+
+def write_json(path, document):
+    with open(path, "w") as f:
+        json.dump(document, f)
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summary(rec):
+    # Per-span calls, total and self time; counters; histogram percentiles
+    spans = {}
+    for name, _, _, duration, own, _ in rec.events:
+        calls, total, self_time, longest = spans.get(name, (0, 0, 0, 0))
+        spans[name] = (calls + 1, total + duration, self_time + own, max(longest, duration))
+    lines = [f"{'span':32} {'calls':>8} {'total ms':>10} {'self ms':>10} {'mean ms':>9} {'max ms':>9}"]
+    for name, (calls, total, self_time, longest) in sorted(spans.items(), key=lambda kv: -kv[1][1]):
+        lines.append(f"{name:32} {calls:8} {total / 1e6:10.2f} {self_time / 1e6:10.2f} "
+                     f"{total / calls / 1e6:9.3f} {longest / 1e6:9.3f}")
+    if rec.counters:
+        lines.append("")
+        lines.append(f"{'counter':32} {'total':>12}")
+        lines.extend(f"{name:32} {total:12}" for name, total in sorted(rec.counters.items()))
+    if rec.histograms:
+        lines.append("")
+        lines.append(f"{'histogram':32} {'count':>8} {'min':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+        for name, values in sorted(rec.histograms.items()):
+            lines.append(f"{name:32} {len(values):8} {min(values):9.4g} {_percentile(values, 0.5):9.4g} "
+                         f"{_percentile(values, 0.9):9.4g} {_percentile(values, 0.99):9.4g} {max(values):9.4g}")
+    return "\n".join(lines)
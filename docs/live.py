@@ -0,0 +1,443 @@
+# Live result processing for many stations reporting at once
+# Stations send game reports as JSON lines over TCP or a Unix socket, or as HTTP POST /report. Every
+# tournament has its own bounded queue and worker task, so reports for one bracket are applied strictly in
+# order while brackets progress independently. A worker drains whatever is queued (up to `batch_size`),
+# applies it through ScoringEngine.record_game, acknowledges each report and publishes one sync.py delta with
+# the changed fields to subscribers (JSON lines on the socket, server-sent events over HTTP). Changed rows are
+# coalesced per match and committed to the TournamentStore, and deltas appended to the DeltaLog, by one
+# writer thread every `flush_interval`.
+import asyncio
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+
+import numpy as np
+
+import instrument
+from bracket_generator import STATUS_NAMES, BracketGenerator
+from export_stream import player_id
+from scoring import ScoringEngine, simulate_games
+from sync import BracketSync, encode, routed_matches, state_rows
+
+BATCH_SIZE = 512
+QUEUE_SIZE = 8192          # reports waiting per tournament before submitters are made to wait
+FLUSH_INTERVAL = 0.05      # seconds between storage commits
+SUBSCRIBER_BACKLOG = 256   # deltas buffered per subscriber before its backlog is replaced by a catch-up
+MAX_BODY = 1 << 16
+REPORT_HELP = 'expected {"tournament": ..., "match": ..., "winner": ...} or "games": [winner, ...]'
+
+
+class LiveTournament:
+    def __init__(self, tournament_id, bracket, match_format="bo3"):
+        self.id = tournament_id
+        self.bracket = bracket
+        self.engine = ScoringEngine(bracket, match_format)
+        self.ids = [player_id(p) for p in bracket.players]
+        self.index = {pid: i for i, pid in enumerate(self.ids)}
+        self.sync = BracketSync(tournament_id, self.rows())
+        self.logged = 0  # deltas in the DeltaLog since its last snapshot
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        self.subscribers = set()
+
+    def apply(self, match_no, winners, touched):
+        # Record the reported games in order; returns the match status name. Raises ValueError on the first
+        # game that cannot be recorded, keeping the games before it.
+        m = self.bracket.matches
+        if not 0 <= match_no < len(m):
+            raise ValueError(f"Unknown match {match_no}")
+        applied = 0
+        try:
+            for winner in winners:
+                index = self.index.get(winner)
+                if index is None:
+                    raise ValueError(f"Unknown player {winner!r}")
+                self.engine.record_game(match_no, index)
+                applied += 1
+        finally:
+            if applied:
+                touched.update(routed_matches(m, match_no))
+        return STATUS_NAMES[m.status[match_no]]
+
+    def rows(self, match_ids=None):
+        return state_rows(self.bracket, self.ids, match_ids)
+
+
+class LiveProcessor:
+    def __init__(self, store=None, log=None, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.store = store
+        self.log = log
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.tournaments = {}
+        self.pending = {}  # (tournament id, match no) -> latest row, coalesced until the next commit
+        self.pending_deltas = {}  # tournament id -> encoded deltas not yet in the log
+        self.tasks = []
+        self.writer = ThreadPoolExecutor(max_workers=1)  # one thread owns every store write, in order
+        self.stats = {"reports": 0, "rejected": 0, "batches": 0, "deltas": 0, "commits": 0, "rows": 0}
+
+    async def start(self):
+        if self.store is not None or self.log is not None:
+            self.tasks.append(asyncio.create_task(self._flush_loop()))
+        return self
+
+    async def close(self):
+        # Finish queued reports, end subscriber streams, stop the workers and commit what is left
+        for live in self.tournaments.values():
+            await live.queue.join()
+            for queue in live.subscribers:
+                while queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        await self.flush()
+        if self.log is not None:
+            await asyncio.get_running_loop().run_in_executor(self.writer, self.log.close)
+        self.writer.shutdown()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def add_tournament(self, tournament_id, bracket, match_format="bo3"):
+        # Start accepting reports for a bracket once its initial snapshot is in the log
+        live = LiveTournament(tournament_id, bracket, match_format)
+        if self.log is not None:
+            await asyncio.get_running_loop().run_in_executor(self.writer, self.log.write_snapshot,
+                                                             tournament_id, live.sync.snapshot())
+        self.tournaments[tournament_id] = live
+        self.tasks.append(asyncio.create_task(self._run(live)))
+        return live
+
+    # Reports
+
+    async def submit(self, tournament_id, match_no, winners):
+        # Queue one report and wait until it is applied; returns {"ok": True, "status": ...} or an error
+        live = self.tournaments.get(tournament_id)
+        if live is None:
+            return {"ok": False, "error": f"Unknown tournament {tournament_id!r}"}
+        if (not isinstance(match_no, int) or isinstance(match_no, bool)
+                or not all(isinstance(winner, str) for winner in winners)):
+            self.stats["rejected"] += 1
+            return {"ok": False, "error": REPORT_HELP}
+        future = asyncio.get_running_loop().create_future()
+        await live.queue.put((match_no, winners, future))
+        return await future
+
+    async def submit_request(self, request):
+        try:
+            tournament_id = request["tournament"]
+            match_no = int(request["match"])
+            winners = list(request["games"]) if "games" in request else [request["winner"]]
+        except (KeyError, TypeError, ValueError):
+            return {"ok": False, "error": REPORT_HELP}
+        if not isinstance(tournament_id, (str, int)):
+            return {"ok": False, "error": REPORT_HELP}
+        return await self.submit(tournament_id, match_no, winners)
+
+    async def _run(self, live):
+        queue = live.queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                self._apply_batch(live, batch)
+            except Exception as exc:
+                # Anything the per-report handling missed: answer whoever is still waiting and keep serving
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_result({"ok": False, "error": f"Internal error: {exc}"})
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    @instrument.traced("live.apply_batch")
+    def _apply_batch(self, live, batch):
+        # Runs without awaiting, so nothing else touches this bracket while the batch is applied
+        touched = set()
+        results = []
+        for match_no, winners, future in batch:
+            try:
+                result = {"ok": True, "status": live.apply(match_no, winners, touched)}
+            except Exception as exc:
+                result = {"ok": False, "error": str(exc)}
+                self.stats["rejected"] += 1
+            results.append((future, result))
+        self.stats["reports"] += len(batch)
+        self.stats["batches"] += 1
+        instrument.observe("live.batch_size", len(batch))
+        rows = live.rows(touched) if touched else []
+        delta = live.sync.update(rows)
+        if delta is not None:
+            message = encode(delta)  # encoded once for the log and every subscriber
+            if self.store is not None:
+                for row in rows:
+                    self.pending[(live.id, row["match_no"])] = dict(row, tournament_id=live.id)
+            if self.log is not None:
+                self.pending_deltas.setdefault(live.id, []).append(message)
+                live.logged += 1
+            self._publish(live, delta["v"], message)
+        for future, result in results:
+            if not future.done():
+                future.set_result(result)
+
+    # Subscribers
+
+    def subscribe(self, tournament_id):
+        # Queue of (version the message applies on, encoded message): a snapshot (-1, it applies on anything)
+        # first, then one delta per applied batch; None ends it
+        live = self.tournaments[tournament_id]
+        queue = asyncio.Queue(SUBSCRIBER_BACKLOG)
+        queue.put_nowait((-1, encode(live.sync.snapshot())))
+        live.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, tournament_id, queue):
+        self.tournaments[tournament_id].subscribers.discard(queue)
+
+    def _publish(self, live, version, message):
+        if not live.subscribers:
+            return
+        self.stats["deltas"] += 1
+        for queue in live.subscribers:
+            if queue.full():
+                # Too far behind: replace its backlog with one merged catch-up from where the backlog started
+                since = queue.get_nowait()[0]
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait((since, encode(live.sync.catch_up(since))))
+            else:
+                queue.put_nowait((version - 1, message))
+
+    # Storage
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        if not self.pending and not self.pending_deltas:
+            return
+        rows, self.pending = list(self.pending.values()), {}
+        deltas, self.pending_deltas = self.pending_deltas, {}
+        # A log that has grown long is replaced by a snapshot taken now, which already covers its pending deltas
+        snapshots = {}
+        for tournament_id in deltas:
+            live = self.tournaments[tournament_id]
+            if live.logged >= self.log.compact_every:
+                snapshots[tournament_id] = live.sync.snapshot()
+                live.logged = 0
+        await asyncio.get_running_loop().run_in_executor(self.writer, self._commit, rows, deltas, snapshots)
+
+    @instrument.traced("live.commit")
+    def _commit(self, rows, deltas, snapshots):
+        if rows:
+            self.store.update_matches(rows)
+        for tournament_id, lines in deltas.items():
+            if tournament_id in snapshots:
+                self.log.write_snapshot(tournament_id, snapshots[tournament_id])
+            else:
+                self.log.append(tournament_id, lines)
+        self.stats["commits"] += 1
+        self.stats["rows"] += len(rows)
+
+    # Transports
+
+    async def serve(self, host="127.0.0.1", port=None, http_port=None, path=None):
+        # Line protocol on `port` and/or the Unix socket `path`, HTTP on `http_port`; returns the servers
+        servers = []
+        if path is not None:
+            servers.append(await asyncio.start_unix_server(self.handle_stream, path))
+        if port is not None:
+            servers.append(await asyncio.start_server(self.handle_stream, host, port))
+        if http_port is not None:
+            servers.append(await asyncio.start_server(self.handle_http, host, http_port))
+        return servers
+
+    async def handle_stream(self, reader, writer):
+        # One JSON report per line, answered in order; {"subscribe": tournament} turns the connection
+        # into a stream of snapshot and delta lines
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+                if isinstance(request, dict) and "subscribe" in request:
+                    await self._stream(writer, request["subscribe"], "{}\n")
+                    return
+                result = (await self.submit_request(request) if isinstance(request, dict)
+                          else {"ok": False, "error": REPORT_HELP})
+                writer.write(json.dumps(result).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_http(self, reader, writer):
+        # Minimal keep-alive HTTP/1.1: POST /report with a JSON body, GET /events/<tournament> as server-sent events
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    _respond(writer, 413, {"ok": False, "error": "Request body too large"})
+                    await writer.drain()
+                    return
+                body = await reader.readexactly(length) if length else b""
+
+                if method == "POST" and target == "/report":
+                    try:
+                        request = json.loads(body)
+                    except ValueError:
+                        request = None
+                    result = (await self.submit_request(request) if isinstance(request, dict)
+                              else {"ok": False, "error": REPORT_HELP})
+                    _respond(writer, 200 if result["ok"] else 422, result)
+                elif method == "GET" and target.startswith("/events/"):
+                    tournament_id = unquote(target[len("/events/"):])
+                    if tournament_id in self.tournaments:
+                        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+                        await self._stream(writer, tournament_id, "data: {}\n\n")
+                        return
+                    _respond(writer, 404, {"ok": False, "error": f"Unknown tournament {tournament_id!r}"})
+                else:
+                    _respond(writer, 404, {"ok": False, "error": f"No route for {method} {target}"})
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, writer, tournament_id, frame):
+        if tournament_id not in self.tournaments:
+            writer.write(json.dumps({"ok": False, "error": f"Unknown tournament {tournament_id!r}"}).encode() + b"\n")
+            await writer.drain()
+            return
+        queue = self.subscribe(tournament_id)
+        try:
+            while (item := await queue.get()) is not None:
+                writer.write(frame.format(item[1]).encode())
+                await writer.drain()
+        finally:
+            self.unsubscribe(tournament_id, queue)
+
+
+HTTP_REASONS = {200: "OK", 404: "Not Found", 413: "Payload Too Large", 422: "Unprocessable Entity"}
+
+
+def _respond(writer, status, document):
+    body = json.dumps(document).encode()
+    writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+
+
+if __name__ == "__main__":
+    from store import TournamentStore
+    from sync import DeltaLog
+
+    async def station(port, reports, latencies):
+        # One setup's connection: send a game, wait for the acknowledgement, send the next
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for report in reports:
+            start = time.perf_counter()
+            writer.write(json.dumps(report).encode() + b"\n")
+            await writer.drain()
+            result = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            assert result["ok"], result
+        writer.close()
+
+    async def watch(port, tournament_id, replica):
+        # A client following one bracket over server-sent events
+        reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 24)  # snapshots are large
+        writer.write(f"GET /events/{tournament_id} HTTP/1.1\r\n\r\n".encode())
+        async for line in reader:
+            if line.startswith(b"data: "):
+                replica.apply(json.loads(line[6:]))
+                replica.received += 1
+
+    async def main(folder, events=8, size=1024, stations=200):
+        store = TournamentStore(os.path.join(folder, "live.db"))
+        log = DeltaLog(os.path.join(folder, "deltas"))
+        players = [f"player-{i}" for i in range(size)]
+        logs = []
+        async with LiveProcessor(store, log) as processor:
+            for e in range(events):
+                tournament_id = f"major-{e}"
+                bracket = BracketGenerator.generateDoubleElimination(players, seed=e)
+                store.add_tournament({"id": tournament_id, "name": f"Major pool {e}", "status": "active"}, bracket)
+                await processor.add_tournament(tournament_id, bracket)
+                # The games this event will be played with, from a simulated copy
+                played = BracketGenerator.generateDoubleElimination(players, seed=e)
+                engine = ScoringEngine(played)
+                simulate_games(played, engine, np.random.default_rng(e))
+                logs.append((tournament_id, engine))
+            servers = await processor.serve(port=0, http_port=0)
+            port, http_port = (server.sockets[0].getsockname()[1] for server in servers)
+            replica = BracketSync("major-0")
+            replica.received = 0
+            watcher = asyncio.create_task(watch(http_port, "major-0", replica))
+
+            # Matches become playable wave by wave (bracket depth); each wave is spread over every station
+            waves = {}
+            for tournament_id, engine in logs:
+                depth = engine.depth()
+                for match_id, winner in zip(engine.game_match, engine.game_winner):
+                    waves.setdefault(int(depth[match_id]), {}).setdefault((tournament_id, int(match_id)), []).append(
+                        {"tournament": tournament_id, "match": int(match_id), "winner": players[winner]})
+            latencies = []
+            start = time.perf_counter()
+            for level in sorted(waves):
+                queues = [[] for _ in range(stations)]
+                for i, games in enumerate(waves[level].values()):
+                    queues[i % stations].extend(games)
+                await asyncio.gather(*(station(port, q, latencies) for q in queues if q))
+            elapsed = time.perf_counter() - start
+            for server in servers:
+                server.close()
+        await watcher
+
+        same = all(np.array_equal(getattr(processor.tournaments[t].bracket.matches, c), getattr(engine.bracket.matches, c))
+                   for t, engine in logs for c in ("winner", "status", "player1_score", "player2_score"))
+        stored = store.matches("major-0", status="completed")
+        latencies.sort()
+        stats = processor.stats
+        print(f"{stats['reports']} reports from {stations} stations over {len(waves)} waves in {elapsed:.1f} s "
+              f"({stats['reports'] / elapsed:.0f}/s)")
+        print(f"  • ack latency: median {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms, max {latencies[-1] * 1000:.1f} ms")
+        print(f"  • {stats['batches']} batches ({stats['reports'] / stats['batches']:.1f} reports each), "
+              f"{stats['rejected']} rejected, {stats['deltas']} deltas published")
+        print(f"  • {stats['commits']} commits, {stats['rows']} rows written; "
+              f"major-0 has {len(stored)} completed matches stored")
+        final = processor.tournaments["major-0"].rows()
+        print(f"  • subscriber on major-0 received {replica.received} messages, replica identical: "
+              f"{replica.rows() == final}; delta log reloads identical: {log.load('major-0').rows() == final}")
+        print(f"  • results identical to offline scoring: {same}")
+        store.close()
+
+    print("SmashScore Live Event Processor")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as folder:
+        asyncio.run(main(folder))
@@ -0,0 +1,217 @@
+# Python model classes generated from app_structure["data_models"] (script.py)
+# Each spec string ("string (UUID)", "number", "timestamp (optional)", "string (pending, active, completed)")
+# becomes a typed field on a slotted dataclass; a parenthesised list of values becomes a choice field.
+# Encoding goes through orjson (which serializes slotted dataclasses natively), decoding builds instances
+# positionally without intermediate copies, and whole batches convert to and from numpy columns.
+import gc
+import operator
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import make_dataclass
+
+import numpy as np
+import orjson
+
+from script import app_structure
+
+KINDS = {"string": str, "number": int, "timestamp": str, "array": list}
+ACCEPTS = {"string": str, "number": (int, float), "timestamp": (str, int, float), "array": list}
+
+
+class FieldSpec:
+    __slots__ = ("name", "kind", "optional", "choices")
+
+    def __init__(self, name, description):
+        self.name = name
+        match = re.match(r"(\w+)\s*(?:\((.*)\))?", description)
+        base, detail = match.group(1), match.group(2) or ""
+        self.kind = base if base in KINDS else "string"
+        self.optional = detail.strip() == "optional"
+        values = [v.strip() for v in detail.split(",")]
+        self.choices = tuple(values) if len(values) > 1 else ()
+
+
+def _validator(fields):
+    # One closure per model so validation is a flat loop over precomputed (name, types, optional, choices)
+    checks = [(operator.attrgetter(f.name), f.name, ACCEPTS[f.kind], f.optional, frozenset(f.choices))
+              for f in fields]
+
+    def validate(obj):
+        errors = []
+        for get, name, accepts, optional, choices in checks:
+            value = get(obj)
+            if value is None:
+                if not optional:
+                    errors.append(f"{name} is required")
+            elif not isinstance(value, accepts) or isinstance(value, bool):
+                errors.append(f"{name} has type {type(value).__name__}")
+            elif choices and value not in choices:
+                errors.append(f"{name} must be one of {', '.join(sorted(choices))}")
+        if errors:
+            raise ValueError(f"Invalid {type(obj).__name__}: {'; '.join(errors)}")
+        return obj
+    return validate
+
+
+def model_class(name, description):
+    # Slotted dataclass for one data_models entry; fields keep the spec order and are all positional
+    fields = [FieldSpec(field, text) for field, text in description.items()]
+    annotations = [(f.name, KINDS[f.kind] | None if f.optional else KINDS[f.kind]) for f in fields]
+    cls = make_dataclass(name, annotations, slots=True, eq=True)
+    cls.fields = tuple(fields)
+    cls.validate = _validator(fields)
+    return cls
+
+
+MODELS = {name: model_class(name, description) for name, description in app_structure["data_models"].items()}
+Player = MODELS["Player"]
+Tournament = MODELS["Tournament"]
+Match = MODELS["Match"]
+
+
+@contextmanager
+def _gc_paused():
+    # Bulk decodes allocate millions of containers that all survive; letting the cyclic collector
+    # rescan them on every generation threshold costs more than the decoding itself
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def encode(obj):
+    return orjson.dumps(obj)
+
+
+def decode(cls, data, validate=True):
+    obj = cls(*map(orjson.loads(data).get, [f.name for f in cls.fields]))
+    return cls.validate(obj) if validate else obj
+
+
+def encode_many(records):
+    return orjson.dumps(records)
+
+
+def decode_many(cls, data, validate=True):
+    getters = [f.name for f in cls.fields]
+    with _gc_paused():
+        records = [cls(*map(row.get, getters)) for row in orjson.loads(data)]
+    if validate:
+        for obj in records:
+            cls.validate(obj)
+    return records
+
+
+def to_columns(cls, records):
+    # name -> numpy array: numbers as int64 (float64, NaN for None, if any value is a float or missing),
+    # choice fields as int8 codes into field.choices, everything else as object arrays
+    columns = {}
+    for f in cls.fields:
+        values = list(map(operator.attrgetter(f.name), records))
+        if f.choices:
+            codes = {choice: i for i, choice in enumerate(f.choices)}
+            columns[f.name] = np.array([codes.get(v, -1) for v in values], dtype=np.int8)
+        elif f.kind == "number":
+            column = None
+            if all(isinstance(v, (int, np.integer)) for v in values):  # np.int64 would truncate 1.5 to 1
+                try:
+                    column = np.array(values, dtype=np.int64)
+                except OverflowError:
+                    pass
+            if column is None:
+                column = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            columns[f.name] = column
+        else:
+            columns[f.name] = _shared_strings(values)
+    return columns
+
+
+def from_columns(cls, columns):
+    lists = []
+    for f in cls.fields:
+        values = columns[f.name].tolist()
+        if f.choices:
+            values = [f.choices[v] if v >= 0 else None for v in values]
+        elif columns[f.name].dtype.kind == "f":
+            values = [None if v != v else v for v in values]  # NaN marks a missing number
+        lists.append(values)
+    with _gc_paused():
+        return list(map(cls, *lists))
+
+
+def _shared_strings(values):
+    # Object column where repeated values (player and tournament ids) share one string object
+    seen = {}
+    column = np.empty(len(values), dtype=object)
+    column[:] = [seen.setdefault(v, v) if isinstance(v, str) else v for v in values]
+    return column
+
+
+def encode_columns(columns):
+    return orjson.dumps({name: column if column.dtype != object else column.tolist()
+                         for name, column in columns.items()}, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def decode_columns(cls, data):
+    with _gc_paused():
+        raw = orjson.loads(data)
+    columns = {}
+    for f in cls.fields:
+        values = raw[f.name]
+        if f.choices:
+            columns[f.name] = np.array(values, dtype=np.int8)
+        elif f.kind == "number":
+            column = np.array(values)
+            if column.dtype == object:
+                column = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            columns[f.name] = column
+        else:
+            columns[f.name] = _shared_strings(values)
+    return columns
+
+
+def synthetic_matches(count, players=4096):
+    rng = np.random.default_rng(0)
+    p1 = rng.integers(0, players, count).tolist()
+    p2 = rng.integers(0, players, count).tolist()
+    s1 = rng.integers(0, 3, count).tolist()
+    status = ("pending", "active", "completed")
+    return [Match(f"m{i}", "t0", f"p{a}", f"p{b}", x, 2 - x, [], status[i % 3], 1 + i % 10, f"winners-{1 + i % 10}-{i}")
+            for i, (a, b, x) in enumerate(zip(p1, p2, s1))]
+
+
+if __name__ == "__main__":
+    import json
+    import tracemalloc
+
+    def measure(label, fn):
+        # Timed without tracing (tracemalloc slows allocation-heavy code several times), then traced
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        result = fn()
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"  • {label}: {elapsed:.2f} s, {held / 2 ** 20:.0f} MiB held")
+        return result
+
+    print("SmashScore Data Models")
+    print("=" * 60)
+    for cls in MODELS.values():
+        print(f"{cls.__name__}: " + ", ".join(f"{f.name}:{f.kind}{'?' if f.optional else ''}"
+                                               + (f"[{'|'.join(f.choices)}]" if f.choices else "") for f in cls.fields))
+    count = 1000000
+    matches = synthetic_matches(count)
+    rows = encode_many(matches)
+    columnar = encode_columns(to_columns(Match, matches))
+    del matches
+    print(f"\nLoading {count} matches ({len(rows) / 2 ** 20:.0f} MiB as rows, {len(columnar) / 2 ** 20:.0f} MiB columnar)")
+    measure("json.loads -> dicts", lambda: json.loads(rows))
+    measure("decode_many -> Match (validated)", lambda: decode_many(Match, rows))
+    measure("decode_many -> Match (unvalidated)", lambda: decode_many(Match, rows, validate=False))
+    measure("decode_columns -> numpy columns", lambda: decode_columns(Match, columnar))
@@ -0,0 +1,29 @@
+# Printing and saving the app_structure spec; kept apart from script.py so cli.py can use them on the
+# pickled spec without executing script.py
+import json
+
+
+def print_overview(app_structure):
+    # Save the structure to understand the complexity
+    print("SmashScore Tournament Tracker - App Architecture Overview")
+    print("=" * 60)
+    print(f"App Name: {app_structure['app_name']}")
+    print(f"Overview: {app_structure['overview']}")
+    print("\nCore Features:")
+    for i, feature in enumerate(app_structure['core_features'], 1):
+        print(f"{i}. {feature}")
+
+    print(f"\nTournament Formats Supported: {len(app_structure['tournament_formats'])}")
+    for fmt in app_structure['tournament_formats']:
+        print(f"  • {fmt['name']}: {fmt['description']}")
+
+    print(f"\nMain Screens: {len(app_structure['screen_structure'])}")
+    for screen in app_structure['screen_structure']:
+        print(f"  • {screen['screen']}: {screen['purpose']}")
+
+
+def save_structure(app_structure, path='smash_tournament_app_structure.json'):
+    # Create a JSON file with the complete structure
+    with open(path, 'w') as f:
+        json.dump(app_structure, f, indent=2)
+    print(f"\nDetailed app structure saved to: {path}")
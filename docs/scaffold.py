@@ -0,0 +1,251 @@
+# Spec-driven scaffolding: compiles the app_structure spec (smash_tournament_app_structure.json, written by
+# script.py) into screens, components, data models and tournament format handlers.
+# Every output is a pure function of a few spec nodes (one screen entry, one model, the list of screen names, ...).
+# The build cache keeps a fingerprint per node and the output -> nodes graph, so after editing one screen entry
+# only the files that read it are re-rendered; an unchanged spec file is not even parsed unless a generated file
+# was deleted or edited by hand, which is then re-rendered too.
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+from emit import drifted, emit, write_atomic
+
+CACHE = ".scaffold-cache.json"
+CACHE_VERSION = 1
+
+FORMAT_IDS = {"Single Elimination": "single_elim", "Double Elimination": "double_elim",
+              "Round Robin": "round_robin", "Swiss System": "swiss"}
+FORMAT_GENERATORS = {"single_elim": "generateSingleElimination", "double_elim": "generateDoubleElimination",
+                     "round_robin": "generateRoundRobin", "swiss": "generateSwiss"}
+JS_DEFAULTS = {"string": "''", "number": "0", "array": "[]", "timestamp": "null"}
+
+
+def pascal_case(text):
+    return "".join(word[:1].upper() + word[1:] for word in re.split(r"[^0-9A-Za-z]+", text) if word)
+
+
+def format_id(name):
+    return FORMAT_IDS.get(name) or "_".join(re.findall(r"[0-9a-z]+", name.lower()))
+
+
+def fingerprint(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, separators=(",", ":")).encode()).hexdigest()[:16]
+
+
+# Rendering: each function gets exactly the nodes listed for its output in compile_spec
+
+def render_screen(screen):
+    name = pascal_case(screen["screen"]) + "Screen"
+    components = screen.get("components", [])
+    imports = "".join(f"import {c} from '../components/{c}';\n" for c in components)
+    body = "".join(f"    <{c} />\n" for c in components)
+    return (f"// screens/{name}.js\n"
+            f"// {screen['screen']}: {screen.get('purpose', '')}\n"
+            "import React from 'react';\n"
+            "import { View, StyleSheet } from 'react-native';\n"
+            f"{imports}\n"
+            f"const {name} = ({{ navigation }}) => (\n"
+            "  <View style={styles.container}>\n"
+            f"{body}"
+            "  </View>\n"
+            ");\n\n"
+            "const styles = StyleSheet.create({\n"
+            "  container: {\n"
+            "    flex: 1,\n"
+            "    backgroundColor: '#f5f5f5',\n"
+            "  },\n"
+            "});\n\n"
+            f"export default {name};\n")
+
+
+def render_component(component, screens):
+    used_by = ", ".join(pascal_case(s["screen"]) + "Screen" for s in screens)
+    return (f"// components/{component}.js\n"
+            f"// Used by: {used_by}\n"
+            "import React from 'react';\n"
+            "import { View, Text } from 'react-native';\n\n"
+            f"const {component} = (props) => (\n"
+            "  <View>\n"
+            f"    <Text>{component}</Text>\n"
+            "  </View>\n"
+            ");\n\n"
+            f"export default {component};\n")
+
+
+def render_navigator(screen_names):
+    names = [pascal_case(s) + "Screen" for s in screen_names]
+    imports = "".join(f"import {n} from '../screens/{n}';\n" for n in names)
+    routes = "".join(f"    <Stack.Screen name=\"{n[:-len('Screen')]}\" component={{{n}}} />\n" for n in names)
+    return ("// navigation/AppNavigator.js\n"
+            "import React from 'react';\n"
+            "import { createStackNavigator } from '@react-navigation/stack';\n"
+            f"{imports}\n"
+            "const Stack = createStackNavigator();\n\n"
+            "const AppNavigator = () => (\n"
+            "  <Stack.Navigator>\n"
+            f"{routes}"
+            "  </Stack.Navigator>\n"
+            ");\n\n"
+            "export default AppNavigator;\n")
+
+
+def render_model(name, fields):
+    lines = []
+    for field, kind in fields.items():
+        base = kind.split(" ", 1)[0]
+        default = JS_DEFAULTS.get(base, "null")
+        lines.append(f"    this.{field} = data.{field} ?? {default}; // {kind}")
+    return (f"// models/{name}.js\n"
+            f"export class {name} {{\n"
+            "  constructor(data = {}) {\n"
+            + "\n".join(lines) + "\n"
+            "  }\n\n"
+            "  static fromJSON(json) {\n"
+            f"    return new {name}(typeof json === 'string' ? JSON.parse(json) : json);\n"
+            "  }\n\n"
+            "  toJSON() {\n"
+            "    return { ...this };\n"
+            "  }\n"
+            "}\n")
+
+
+def render_format(fmt):
+    fid = format_id(fmt["name"])
+    generator = FORMAT_GENERATORS.get(fid, "generate" + pascal_case(fmt["name"]))
+    return (f"// formats/{fid}.js\n"
+            f"// {fmt['name']}: {fmt.get('description', '')}\n"
+            f"// Bracket: {fmt.get('bracket_type', '')}. Use case: {fmt.get('use_case', '')}\n"
+            "import { BracketGenerator } from '../utils/BracketGenerator';\n\n"
+            "export default {\n"
+            f"  id: '{fid}',\n"
+            f"  name: '{fmt['name']}',\n"
+            "  createBracket: (players) => BracketGenerator." + generator + "(players),\n"
+            "};\n")
+
+
+def compile_spec(spec):
+    # Returns (nodes, outputs): node key -> spec value, output path -> (render function, node keys)
+    nodes = {}
+    outputs = {}
+    screens = spec.get("screen_structure", [])
+    users = {}
+    for screen in screens:
+        key = "screen:" + screen["screen"]
+        nodes[key] = screen
+        outputs[f"screens/{pascal_case(screen['screen'])}Screen.js"] = (render_screen, [key])
+        for component in screen.get("components", []):
+            users.setdefault(component, []).append(key)
+    for component, keys in users.items():
+        outputs[f"components/{component}.js"] = (render_component, keys)
+
+    nodes["screens"] = [s["screen"] for s in screens]
+    outputs["navigation/AppNavigator.js"] = (render_navigator, ["screens"])
+
+    for name, fields in spec.get("data_models", {}).items():
+        nodes["model:" + name] = fields
+        outputs[f"models/{name}.js"] = (render_model, ["model:" + name])
+    for fmt in spec.get("tournament_formats", []):
+        nodes["format:" + fmt["name"]] = fmt
+        outputs[f"formats/{format_id(fmt['name'])}.js"] = (render_format, ["format:" + fmt["name"]])
+    return nodes, outputs
+
+
+def _render(output, render, keys, nodes):
+    if render is render_component:
+        return render(output[len("components/"):-len(".js")], [nodes[k] for k in keys])
+    if render is render_model:
+        return render(keys[0].split(":", 1)[1], nodes[keys[0]])
+    return render(nodes[keys[0]])
+
+
+def _load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return cache if cache.get("version") == CACHE_VERSION else None
+
+
+def build(spec_path, out=".", workers=8):
+    # Returns a summary dict: rendered outputs, files written, unchanged files, stale files removed
+    cache_path = os.path.join(out, CACHE)
+    cache = _load_cache(cache_path) or {"version": CACHE_VERSION, "spec": None, "nodes": {}, "graph": {}}
+    st = os.stat(spec_path)
+    source = [os.path.abspath(spec_path), st.st_size, st.st_mtime_ns]
+    drift = set(drifted(cache["graph"], root=out))
+    if cache["spec"] == source and not drift:
+        return {"rendered": [], "written": [], "unchanged": list(cache["graph"]), "removed": []}
+
+    with open(spec_path, encoding="utf-8") as f:
+        spec = json.load(f)
+    nodes, outputs = compile_spec(spec)
+    prints = {key: fingerprint(value) for key, value in nodes.items()}
+    changed = {key for key in prints.keys() | cache["nodes"].keys() if prints.get(key) != cache["nodes"].get(key)}
+
+    old_graph = cache["graph"]
+    dirty = [path for path, (_, keys) in outputs.items()
+             if path not in old_graph or path in drift
+             or changed.intersection(keys) or changed.intersection(old_graph[path])]
+    jobs = {path: (lambda path=path: _render(path, outputs[path][0], outputs[path][1], nodes)) for path in dirty}
+    written, unchanged = emit(jobs, root=out, workers=workers)
+
+    removed = []
+    for path in old_graph.keys() - outputs.keys():
+        target = os.path.join(out, path)
+        if os.path.exists(target):
+            os.remove(target)
+            removed.append(path)
+
+    cache = {"version": CACHE_VERSION, "spec": source, "nodes": prints,
+             "graph": {path: keys for path, (_, keys) in outputs.items()}}
+    write_atomic(cache_path, json.dumps(cache).encode("utf-8"))
+    return {"rendered": dirty, "written": written,
+            "unchanged": unchanged + [p for p in outputs if p not in jobs], "removed": sorted(removed)}
+
+
+def synthetic_spec(screens=200, components=8, models=20):
+    spec = {"screen_structure": [], "data_models": {}, "tournament_formats": []}
+    for i in range(screens):
+        spec["screen_structure"].append({"screen": f"Screen {i}", "purpose": f"Synthetic screen {i}",
+                                         "components": [f"Widget{(i * 7 + j) % (screens * 2)}" for j in range(components)]})
+    for i in range(models):
+        spec["data_models"][f"Model{i}"] = {"id": "string (UUID)", "count": "number", "items": "array of ids",
+                                            "created_at": "timestamp"}
+    for name in FORMAT_IDS:
+        spec["tournament_formats"].append({"name": name, "description": name, "bracket_type": "", "use_case": ""})
+    return spec
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        summary = build(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else "scaffold")
+        print(f"Rendered {len(summary['rendered'])}, wrote {len(summary['written'])}, "
+              f"unchanged {len(summary['unchanged'])}, removed {len(summary['removed'])}")
+        sys.exit(0)
+
+    import tempfile
+
+    print("SmashScore Scaffolding")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as folder:
+        spec_path = os.path.join(folder, "spec.json")
+        out = os.path.join(folder, "app")
+        spec = synthetic_spec()
+        with open(spec_path, "w") as f:
+            json.dump(spec, f)
+        for label in ("Full build", "No-op rebuild"):
+            start = time.perf_counter()
+            summary = build(spec_path, out)
+            print(f"  • {label}: {len(summary['rendered'])} rendered, {len(summary['written'])} written "
+                  f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        spec["screen_structure"][10]["purpose"] = "Edited"
+        with open(spec_path, "w") as f:
+            json.dump(spec, f)
+        start = time.perf_counter()
+        summary = build(spec_path, out)
+        print(f"  • One screen edited: {len(summary['rendered'])} rendered, {len(summary['written'])} written "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
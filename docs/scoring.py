@@ -0,0 +1,221 @@
+# Bo3/Bo5 match scoring on top of a Bracket from bracket_generator.py
+# Per-match state is the bracket's own player1_score/player2_score/status columns plus one `need` column
+# (games required to win, from app_structure["match_formats"]). Live games are checked one at a time and a
+# decided match is routed with Bracket.record_result. Re-ingesting a whole event replays every game in one
+# vectorized pass per bracket depth: players are pulled in through prev_match1/prev_match2, then each
+# depth's games are validated, tallied and cut off at the deciding game with grouped cumulative sums.
+import re
+import time
+
+import numpy as np
+
+import instrument
+from bracket_generator import ACTIVE, BYE, COMPLETED, GRAND_FINAL, NO_MATCH, BracketGenerator
+from script import app_structure
+
+
+def _wins_needed():
+    # "Best of 3 (Bo3)" with 3 games -> {"bo3": 2}
+    formats = {}
+    for fmt in app_structure["match_formats"]:
+        key = re.search(r"\((\w+)\)", fmt["format"]).group(1).lower()
+        formats[key] = fmt["games"] // 2 + 1
+    return formats
+
+
+WINS_NEEDED = _wins_needed()
+STATE_COLUMNS = ("player1", "player2", "player1_score", "player2_score", "winner", "status")
+
+
+class ScoringEngine:
+    def __init__(self, bracket, match_format="bo3"):
+        self.bracket = bracket
+        m = bracket.matches
+        self.need = np.full(len(m), WINS_NEEDED[match_format], dtype=np.int8)
+        # Seeded state (first round players, bye advances) that a full re-ingest starts from
+        self.initial = {name: getattr(m, name).copy() for name in STATE_COLUMNS}
+        self.game_match = []
+        self.game_winner = []
+        self._depth = None
+
+    def set_format(self, match_ids, match_format):
+        # e.g. Bo5 for the grand final: engine.set_format(bracket.round_matches(1, GRAND_FINAL), "bo5")
+        self.need[np.asarray(match_ids)] = WINS_NEEDED[match_format]
+
+    @instrument.traced("scoring.record_game")
+    def record_game(self, match_id, winner):
+        # One live game; returns the match status code after it
+        m = self.bracket.matches
+        if m.status[match_id] == COMPLETED:
+            raise ValueError(f"Match {match_id} is already decided")
+        p1, p2 = m.player1[match_id], m.player2[match_id]
+        if p1 == BYE or p2 == BYE:
+            raise ValueError(f"Match {match_id} is still waiting for its players")
+        if winner != p1 and winner != p2:
+            raise ValueError(f"Player {winner} is not playing match {match_id}")
+        score = m.player1_score if winner == p1 else m.player2_score
+        score[match_id] += 1
+        m.status[match_id] = ACTIVE
+        self.game_match.append(match_id)
+        self.game_winner.append(winner)
+        if score[match_id] >= self.need[match_id]:
+            self.bracket.record_result(match_id, winner)
+        return m.status[match_id]
+
+    def games_by_match(self):
+        # {match_no: [player id per game]}, the shape ArchiveWriter.add_tournament takes
+        games = {}
+        for match_id, winner in zip(self.game_match, self.game_winner):
+            games.setdefault(int(match_id), []).append(self.bracket.players[winner])
+        return games
+
+    def depth(self):
+        # Longest feeder chain above every match; feeders always have smaller ids, so a few
+        # relaxation sweeps (one per bracket depth) settle it
+        if self._depth is None:
+            m = self.bracket.matches
+            depth = np.zeros(len(m), dtype=np.int32)
+            while True:
+                new = depth.copy()
+                for prev in (m.prev_match1, m.prev_match2):
+                    linked = prev != NO_MATCH
+                    new[linked] = np.maximum(new[linked], depth[prev[linked]] + 1)
+                if np.array_equal(new, depth):
+                    break
+                depth = new
+            self._depth = depth
+        return self._depth
+
+    def _pull_players(self, ids):
+        # Fill both slots of `ids` from completed feeders: the feeder's winner when this match is its
+        # next_match in that slot, otherwise its loser (double elimination drop-downs, bracket reset)
+        m = self.bracket.matches
+        ids = ids[m.status[ids] != COMPLETED]
+        for slot, prev, target in ((0, m.prev_match1, m.player1), (1, m.prev_match2, m.player2)):
+            src = prev[ids]
+            ready = (src != NO_MATCH)
+            ready[ready] = m.status[src[ready]] == COMPLETED
+            dst, src = ids[ready], src[ready]
+            winner = m.winner[src]
+            other = np.where(m.player1[src] == winner, m.player2[src], m.player1[src])
+            loser = np.where(winner == BYE, BYE, other)
+            via_next = (m.next_match[src] == dst) & (m.next_slot[src] == slot)
+            target[dst] = np.where(via_next, winner, loser)
+
+        # Matches expecting a single entrant complete as soon as it arrives
+        single = ids[(m.entrants[ids] == 1) & ((m.player1[ids] != BYE) | (m.player2[ids] != BYE))]
+        m.winner[single] = np.maximum(m.player1[single], m.player2[single])
+        m.status[single] = COMPLETED
+
+    @instrument.traced("scoring.ingest")
+    def ingest(self, game_matches, game_winners):
+        # Replace all results with this event's games (in play order); returns the accepted-game mask.
+        # A game is rejected when its match cannot be played yet, its winner is not in the match,
+        # or the match was already decided by an earlier game.
+        m = self.bracket.matches
+        for name in STATE_COLUMNS:
+            getattr(m, name)[:] = self.initial[name]
+        game_matches = np.asarray(game_matches, dtype=np.int64)
+        game_winners = np.asarray(game_winners, dtype=np.int32)
+        depth = self.depth()
+        order = np.lexsort((game_matches, depth[game_matches]))
+        sorted_depth = depth[game_matches[order]]
+        accepted = np.zeros(len(game_matches), dtype=bool)
+        levels = depth.max() + 1 if len(depth) else 0
+        bounds = np.searchsorted(sorted_depth, np.arange(levels + 1))
+        by_depth = np.argsort(depth, kind="stable")
+        match_bounds = np.searchsorted(depth[by_depth], np.arange(levels + 1))
+
+        for level in range(levels):
+            ids = by_depth[match_bounds[level]:match_bounds[level + 1]]
+            self._pull_players(ids)
+            games = order[bounds[level]:bounds[level + 1]]
+            gm, gw = game_matches[games], game_winners[games]
+            p1, p2 = m.player1[gm], m.player2[gm]
+            valid = (p1 != BYE) & (p2 != BYE) & ((gw == p1) | (gw == p2)) & (m.status[gm] != COMPLETED)
+            games, gm, gw, first = games[valid], gm[valid], gw[valid], gw[valid] == p1[valid]
+            instrument.observe("scoring.games_per_depth", len(games))
+            if len(games):
+                self._tally(games, gm, first, accepted)
+            self._reset_skips(ids)
+        instrument.count("scoring.games_accepted", int(accepted.sum()))
+        instrument.count("scoring.games_rejected", int(len(accepted) - accepted.sum()))
+        self.game_match = game_matches[accepted].tolist()
+        self.game_winner = game_winners[accepted].tolist()
+        return accepted
+
+    def _tally(self, games, gm, first, accepted):
+        # Grouped running scores per match; everything after the deciding game is rejected
+        m = self.bracket.matches
+        group_start = np.flatnonzero(np.concatenate([[True], gm[1:] != gm[:-1]]))
+        starts = np.repeat(group_start, np.diff(np.append(group_start, len(gm))))
+
+        def grouped_cumsum(flags):
+            total = np.cumsum(flags, dtype=np.int64)
+            return total - (total[starts] - flags[starts])
+
+        c1 = grouped_cumsum(first.astype(np.int64))
+        c2 = grouped_cumsum((~first).astype(np.int64))
+        need = self.need[gm]
+        deciding = np.where(first, c1, c2) == need
+        decided_before = grouped_cumsum(deciding.astype(np.int64)) - deciding
+        keep = decided_before == 0
+        accepted[games[keep]] = True
+
+        last = np.append(group_start[1:], len(gm)) - 1
+        # Last kept game per match: the deciding game if there is one, otherwise the last game
+        kept_index = np.flatnonzero(keep)
+        last_kept = kept_index[np.searchsorted(kept_index, last, side="right") - 1]
+        ids = gm[last_kept]
+        m.player1_score[ids] = c1[last_kept]
+        m.player2_score[ids] = c2[last_kept]
+        won = deciding[last_kept]
+        m.status[ids[~won]] = ACTIVE
+        done = ids[won]
+        m.winner[done] = np.where(first[last_kept][won], m.player1[done], m.player2[done])
+        m.status[done] = COMPLETED
+
+    def _reset_skips(self, ids):
+        # A grand final won by the winners bracket champion (player1) completes the reset unplayed
+        m = self.bracket.matches
+        finals = ids[(m.bracket[ids] == GRAND_FINAL) & (m.round[ids] == 1) & (m.status[ids] == COMPLETED)]
+        finals = finals[(m.winner[finals] == m.player1[finals]) & (m.next_match[finals] != NO_MATCH)]
+        reset = m.next_match[finals]
+        m.winner[reset] = m.winner[finals]
+        m.status[reset] = COMPLETED
+
+
+def simulate_games(bracket, engine, rng):
+    # Play an event to completion through record_game with random game winners
+    m = bracket.matches
+    while True:
+        ready = np.flatnonzero((m.status != COMPLETED) & (m.player1 != BYE) & (m.player2 != BYE))
+        if not len(ready):
+            return
+        for match_id in ready.tolist():
+            while m.status[match_id] != COMPLETED:
+                engine.record_game(match_id, m.player1[match_id] if rng.random() < 0.5 else m.player2[match_id])
+
+
+if __name__ == "__main__":
+    print("SmashScore Match Scoring")
+    print("=" * 60)
+    rng = np.random.default_rng(11)
+    for generate, size in ((lambda p: BracketGenerator.generateSingleElimination(p, seed=1), 4096),
+                           (lambda p: BracketGenerator.generateDoubleElimination(p, seed=1), 4096),
+                           (BracketGenerator.generateRoundRobin, 128)):
+        live = generate(list(range(size)))
+        engine = ScoringEngine(live)
+        start = time.perf_counter()
+        simulate_games(live, engine, rng)
+        played = time.perf_counter() - start
+        games = len(engine.game_match)
+
+        replay = generate(list(range(size)))
+        batch = ScoringEngine(replay)
+        start = time.perf_counter()
+        accepted = batch.ingest(engine.game_match, engine.game_winner)
+        ingested = time.perf_counter() - start
+        same = all(np.array_equal(getattr(live.matches, c), getattr(replay.matches, c)) for c in STATE_COLUMNS)
+        print(f"  • {live.format}, {size} entrants, {games} games: live {played * 1000:.0f} ms, "
+              f"re-ingest {ingested * 1000:.1f} ms, {accepted.sum()} accepted, identical {same}")
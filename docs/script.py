@@ -1,5 +1,5 @@
 # Create a comprehensive app architecture plan for the Smash score tracking tournament app
-import json
+from overview import print_overview, save_structure
 
 # Define the app structure and components
 app_structure = {
@@ -128,25 +128,7 @@ app_structure = {
     }
 }
 
-# Save the structure to understand the complexity
-print("SmashScore Tournament Tracker - App Architecture Overview")
-print("=" * 60)
-print(f"App Name: {app_structure['app_name']}")
-print(f"Overview: {app_structure['overview']}")
-print("\nCore Features:")
-for i, feature in enumerate(app_structure['core_features'], 1):
-    print(f"{i}. {feature}")
 
-print(f"\nTournament Formats Supported: {len(app_structure['tournament_formats'])}")
-for fmt in app_structure['tournament_formats']:
-    print(f"  • {fmt['name']}: {fmt['description']}")
-
-print(f"\nMain Screens: {len(app_structure['screen_structure'])}")
-for screen in app_structure['screen_structure']:
-    print(f"  • {screen['screen']}: {screen['purpose']}")
-
-# Create a JSON file with the complete structure
-with open('smash_tournament_app_structure.json', 'w') as f:
-    json.dump(app_structure, f, indent=2)
-
-print(f"\nDetailed app structure saved to: smash_tournament_app_structure.json")
\ No newline at end of file
+if __name__ == "__main__":
+    print_overview(app_structure)
+    save_structure(app_structure)
@@ -0,0 +1,94 @@
+# Bracket seeding as integer permutations, replacing the sort(() => Math.random() - 0.5) shuffle
+# Every mode produces `lines`: the player id on each first-round bracket line (BYE when empty),
+# where lines 2i and 2i + 1 meet in first-round match i
+import hashlib
+import math
+
+import numpy as np
+
+import instrument
+
+BYE = -1
+
+
+def random_order(n, seed=None):
+    # Fisher-Yates over the raw PCG64 stream; the raw stream is stable across NumPy releases,
+    # so the same seed gives the same permutation byte for byte
+    draws = np.random.PCG64(seed).random_raw(max(n - 1, 0)).tolist()
+    order = list(range(n))
+    for k, i in enumerate(range(n - 1, 0, -1)):
+        j = draws[k] % (i + 1)
+        order[i], order[j] = order[j], order[i]
+    return np.array(order, dtype=np.int32)
+
+
+def rating_order(ratings):
+    # Player ids from highest to lowest rating, ties kept in entry order
+    ratings = np.asarray(ratings)
+    return np.argsort(-ratings, kind="stable").astype(np.int32)
+
+
+def standard_lines(slots):
+    # Seed index (0-based) on each line: 1 v 16, 8 v 9, 4 v 13, ... built by doubling
+    lines = np.zeros(1, dtype=np.int32)
+    while len(lines) < slots:
+        size = 2 * len(lines)
+        lines = np.stack([lines, size - 1 - lines], axis=1).ravel()
+    return lines
+
+
+def bracket_lines(order, slots):
+    # Place players ranked by `order` on the standard lines; seeds past the field are byes
+    seeds = standard_lines(slots)
+    return np.where(seeds < len(order), np.asarray(order, dtype=np.int32)[np.minimum(seeds, len(order) - 1)], BYE)
+
+
+def region_lines(regions, order, slots):
+    # Spread players of the same region as far apart as possible: walk the bracket lines in
+    # bit-reversed order (each next line sits in the half furthest from the previous ones) and fill
+    # them region by region, largest region first, keeping `order` inside each region
+    order = np.asarray(order, dtype=np.int32)
+    regions = np.asarray(regions)[order]
+    codes, inverse, sizes = np.unique(regions, return_inverse=True, return_counts=True)
+    rank = np.argsort(-sizes, kind="stable").argsort()
+    placed = order[np.lexsort((np.arange(len(order)), rank[inverse]))]
+
+    # Bit reversal of the match index, then alternate player1/player2 so byes stay on player2
+    bits = int(math.log2(slots)) - 1
+    matches = np.arange(slots // 2)
+    reversed_matches = np.zeros_like(matches)
+    for b in range(bits):
+        reversed_matches |= ((matches >> b) & 1) << (bits - 1 - b)
+    walk = np.concatenate([2 * reversed_matches, 2 * reversed_matches + 1])
+
+    lines = np.full(slots, BYE, dtype=np.int32)
+    lines[walk[:len(placed)]] = placed
+    return lines
+
+
+@instrument.traced("seeding.seed_lines")
+def seed_lines(n, mode="random", seed=None, ratings=None, regions=None):
+    # Single entry point for BracketGenerator: "random", "rating" or "region"
+    slots = 1 << math.ceil(math.log2(n))
+    if mode == "random":
+        return bracket_lines(random_order(n, seed), slots)
+    if mode == "rating":
+        return bracket_lines(rating_order(ratings), slots)
+    if mode == "region":
+        order = rating_order(ratings) if ratings is not None else random_order(n, seed)
+        return region_lines(regions, order, slots)
+    raise ValueError(f"Unknown seeding mode: {mode}")
+
+
+def digest(lines):
+    # Audit fingerprint of a seeding
+    return hashlib.sha256(np.asarray(lines, dtype="<i4").tobytes()).hexdigest()
+
+
+if __name__ == "__main__":
+    print("SmashScore Seeding")
+    print("=" * 60)
+    print(f"Standard 16-slot lines: {(standard_lines(16) + 1).tolist()}")
+    first = digest(seed_lines(10000, seed=2024))
+    second = digest(seed_lines(10000, seed=2024))
+    print(f"10k random seeding reproducible: {first == second} ({first[:16]})")
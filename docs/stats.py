@@ -0,0 +1,198 @@
+# Incremental win/loss aggregation behind calculateWinRate (helper.ts) and the W/L column in PlayerManagement.js
+# Match results arrive as events and update array-backed counters in O(1); backfills recompute the
+# same counters in one vectorized pass. A wins-bucket index answers top-K without sorting every player.
+import math
+import time
+
+import numpy as np
+
+FORMATS = ("single_elim", "double_elim", "round_robin", "swiss")
+
+
+class Interner:
+    # Maps external ids (UUID strings) to dense integer ids and back
+    def __init__(self):
+        self.index = {}
+        self.values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def intern(self, value):
+        key = self.index.get(value)
+        if key is None:
+            key = self.index[value] = len(self.values)
+            self.values.append(value)
+        return key
+
+    def intern_many(self, values):
+        return np.fromiter((self.intern(v) for v in values), dtype=np.int64)
+
+
+class Counters:
+    # wins/losses columns with doubling capacity; `width` columns per row (one per format, or one)
+    def __init__(self, width=1, capacity=1024):
+        self.wins = np.zeros((capacity, width), dtype=np.int64)
+        self.losses = np.zeros((capacity, width), dtype=np.int64)
+
+    def reserve(self, size):
+        capacity = len(self.wins)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("wins", "losses"):
+            column = getattr(self, name)
+            grown = np.zeros((capacity, column.shape[1]), dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+
+class Leaderboard:
+    # Players bucketed by win count: an increment moves one player between adjacent buckets
+    def __init__(self):
+        self.buckets = {}
+        self.top = 0
+
+    def move(self, player, old, new):
+        bucket = self.buckets.get(old)
+        if bucket is not None:
+            bucket.discard(player)
+            if not bucket:
+                del self.buckets[old]
+        self.buckets.setdefault(new, set()).add(player)
+        if new > self.top:
+            self.top = new
+        while self.top > 0 and self.top not in self.buckets:
+            self.top -= 1
+
+    def rebuild(self, wins):
+        order = np.argsort(wins, kind="stable")
+        values, starts = np.unique(wins[order], return_index=True)
+        groups = np.split(order, starts[1:])
+        self.buckets = {int(v): set(g.tolist()) for v, g in zip(values, groups)}
+        self.top = int(values[-1]) if len(values) else 0
+
+    def top_k(self, k):
+        result = []
+        for wins in range(self.top, -1, -1):
+            bucket = self.buckets.get(wins)
+            if bucket:
+                result.extend((player, wins) for player in sorted(bucket))
+                if len(result) >= k:
+                    break
+        return result[:k]
+
+
+def win_rate(wins, losses):
+    # Same rounding as calculateWinRate in helper.ts: Math.round sends halves up, where round() goes to even
+    total = wins + losses
+    return 0 if total == 0 else math.floor(wins / total * 100 + 0.5)
+
+
+class StatsEngine:
+    def __init__(self):
+        self.players = Interner()
+        self.tournaments = Interner()
+        self.entries = Interner()  # (tournament, player) pairs
+        self.overall = Counters(width=len(FORMATS))
+        self.per_tournament = Counters()
+        self.leaderboard = Leaderboard()
+
+    def _player(self, player_id):
+        new = player_id not in self.players.index
+        player = self.players.intern(player_id)
+        if new:
+            self.overall.reserve(len(self.players))
+            self.leaderboard.move(player, None, 0)
+        return player
+
+    def _entry(self, tournament, player):
+        entry = self.entries.intern((tournament, player))
+        self.per_tournament.reserve(len(self.entries))
+        return entry
+
+    def record(self, winner_id, loser_id, tournament_id, format, count=1):
+        # One completed match; count=-1 reverts a result that was corrected
+        column = FORMATS.index(format)
+        winner, loser = self._player(winner_id), self._player(loser_id)
+        tournament = self.tournaments.intern(tournament_id)
+        old = int(self.overall.wins[winner].sum())
+        self.overall.wins[winner, column] += count
+        self.overall.losses[loser, column] += count
+        self.per_tournament.wins[self._entry(tournament, winner), 0] += count
+        self.per_tournament.losses[self._entry(tournament, loser), 0] += count
+        self.leaderboard.move(winner, old, old + count)
+
+    def backfill(self, winner_ids, loser_ids, tournament_ids, formats):
+        # Rebuild every counter from a full history in one pass
+        self.__init__()
+        winners = self.players.intern_many(winner_ids)
+        losers = self.players.intern_many(loser_ids)
+        tournaments = self.tournaments.intern_many(tournament_ids)
+        columns = np.fromiter((FORMATS.index(f) for f in formats), dtype=np.int64)
+        n, width = len(self.players), len(FORMATS)
+        self.overall.reserve(n)
+        self.overall.wins[:n] = np.bincount(winners * width + columns, minlength=n * width).reshape(n, width)
+        self.overall.losses[:n] = np.bincount(losers * width + columns, minlength=n * width).reshape(n, width)
+
+        winner_entries = self.entries.intern_many(zip(tournaments.tolist(), winners.tolist()))
+        loser_entries = self.entries.intern_many(zip(tournaments.tolist(), losers.tolist()))
+        e = len(self.entries)
+        self.per_tournament.reserve(e)
+        self.per_tournament.wins[:e, 0] = np.bincount(winner_entries, minlength=e)
+        self.per_tournament.losses[:e, 0] = np.bincount(loser_entries, minlength=e)
+        self.leaderboard.rebuild(self.overall.wins[:n].sum(axis=1))
+
+    def player_stats(self, player_id, format=None):
+        player = self.players.index.get(player_id)
+        if player is None:
+            return {"wins": 0, "losses": 0, "win_rate": 0}
+        columns = slice(None) if format is None else FORMATS.index(format)
+        wins = int(self.overall.wins[player, columns].sum())
+        losses = int(self.overall.losses[player, columns].sum())
+        return {"wins": wins, "losses": losses, "win_rate": win_rate(wins, losses)}
+
+    def tournament_stats(self, tournament_id, player_id):
+        entry = self.entries.index.get((self.tournaments.index.get(tournament_id), self.players.index.get(player_id)))
+        if entry is None:
+            return {"wins": 0, "losses": 0}
+        return {"wins": int(self.per_tournament.wins[entry, 0]), "losses": int(self.per_tournament.losses[entry, 0])}
+
+    def top_by_wins(self, k=10):
+        return [(self.players.values[p], wins) for p, wins in self.leaderboard.top_k(k)]
+
+    def top_by_win_rate(self, k=10, min_matches=10):
+        # argpartition selects the k best in O(n); only those k are sorted
+        n = len(self.players)
+        wins = self.overall.wins[:n].sum(axis=1)
+        total = wins + self.overall.losses[:n].sum(axis=1)
+        rate = np.where(total >= min_matches, wins / np.maximum(total, 1), -1.0)
+        k = min(k, n)
+        best = np.argpartition(-rate, k - 1)[:k] if k else np.array([], dtype=np.int64)
+        best = best[np.argsort(-rate[best], kind="stable")]
+        return [(self.players.values[p], win_rate(int(wins[p]), int(total[p] - wins[p]))) for p in best if rate[p] >= 0]
+
+
+if __name__ == "__main__":
+    print("SmashScore Stats Engine")
+    print("=" * 60)
+    assert [win_rate(1, 7), win_rate(3, 5), win_rate(5, 3), win_rate(0, 0)] == [13, 38, 63, 0]  # .5 rounds up
+    rng = np.random.default_rng(3)
+    size = 1000000
+    winners = [f"player-{i}" for i in rng.integers(0, 50000, size)]
+    losers = [f"player-{i}" for i in rng.integers(0, 50000, size)]
+    tournaments = [f"event-{i}" for i in rng.integers(0, 500, size)]
+    formats = [FORMATS[i] for i in rng.integers(0, 4, size)]
+
+    engine = StatsEngine()
+    start = time.perf_counter()
+    engine.backfill(winners, losers, tournaments, formats)
+    print(f"Backfill of {size} matches: {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    for i in range(100000):
+        engine.record(winners[i], losers[i], tournaments[i], formats[i])
+    print(f"Live updates: {(time.perf_counter() - start) / 100000 * 1e6:.1f} µs per match")
+    print(f"Top 3 by wins: {engine.top_by_wins(3)}")
+    print(f"Top 3 by win rate: {engine.top_by_win_rate(3)}")
@@ -0,0 +1,250 @@
+# Indexed SQLite store for the Player / Tournament / Match data models in script.py
+# Replaces "read the whole tournaments blob, JSON.parse, linear find" with keyed lookups:
+# primary keys on ids plus secondary indexes on tournament_id, player_id, status and round.
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from bracket_generator import BRACKET_NAMES, BYE, STATUS_NAMES, BracketGenerator
+
+BATCH_SIZE = 50000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    tag TEXT,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    format TEXT NOT NULL,
+    match_format TEXT,
+    status TEXT NOT NULL,
+    created_at TEXT,
+    completed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS tournament_players (
+    tournament_id TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    PRIMARY KEY (tournament_id, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    tournament_id TEXT NOT NULL,
+    match_no INTEGER NOT NULL,
+    player1_id TEXT,
+    player2_id TEXT,
+    player1_score INTEGER NOT NULL DEFAULT 0,
+    player2_score INTEGER NOT NULL DEFAULT 0,
+    winner_id TEXT,
+    games TEXT,
+    status TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    bracket_position TEXT
+);
+CREATE INDEX IF NOT EXISTS tournaments_status ON tournaments (status);
+CREATE INDEX IF NOT EXISTS tournament_players_player ON tournament_players (player_id);
+CREATE UNIQUE INDEX IF NOT EXISTS matches_tournament ON matches (tournament_id, match_no);
+CREATE INDEX IF NOT EXISTS matches_round ON matches (tournament_id, round);
+CREATE INDEX IF NOT EXISTS matches_status ON matches (tournament_id, status);
+CREATE INDEX IF NOT EXISTS matches_player1 ON matches (player1_id);
+CREATE INDEX IF NOT EXISTS matches_player2 ON matches (player2_id);
+"""
+
+MATCH_COLUMNS = ("id", "tournament_id", "match_no", "player1_id", "player2_id", "player1_score",
+                 "player2_score", "winner_id", "games", "status", "round", "bracket_position")
+# Columns that change while a match is played
+MATCH_STATE = ("player1_id", "player2_id", "player1_score", "player2_score", "winner_id", "status")
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class TournamentStore:
+    def __init__(self, path=":memory:"):
+        # The connection may be handed to a single writer thread (live.py); callers serialize writes
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.execute("PRAGMA foreign_keys = OFF")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # Bulk writes: one transaction per batch of rows (per tournament for add_tournament)
+
+    def _insert_many(self, sql, rows, batch_size=BATCH_SIZE):
+        count = 0
+        for batch in _batches(rows, batch_size):
+            with self.db:
+                self.db.executemany(sql, batch)
+            count += len(batch)
+        return count
+
+    def add_players(self, players):
+        rows = ((p["id"], p["name"], p.get("tag", ""), p.get("wins", 0), p.get("losses", 0),
+                 p.get("created_at") or _now()) for p in players)
+        return self._insert_many("INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def add_tournament(self, tournament, bracket=None):
+        # Store a tournament row and, when given, every match of its Bracket straight from the columns.
+        # Saving an existing tournament again replaces its players and matches; the save is one transaction.
+        format = tournament.get("format") or (bracket.format if bracket is not None else None)
+        if format is None:
+            raise ValueError(f"Tournament {tournament['id']!r} needs a format when no bracket is given")
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO tournaments VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (tournament["id"], tournament["name"], format,
+                 tournament.get("match_format", "bo3"), tournament.get("status", "setup"),
+                 tournament.get("created_at") or _now(), tournament.get("completed_at")),
+            )
+            if bracket is None:
+                return 0
+            ids = [p["id"] if isinstance(p, dict) else p for p in bracket.players]
+            self.db.execute("DELETE FROM tournament_players WHERE tournament_id = ?", (tournament["id"],))
+            self.db.execute("DELETE FROM matches WHERE tournament_id = ?", (tournament["id"],))
+            self.db.executemany("INSERT OR REPLACE INTO tournament_players VALUES (?, ?)",
+                                ((tournament["id"], pid) for pid in ids))
+            self.db.executemany(
+                "INSERT INTO matches (tournament_id, match_no, player1_id, player2_id, player1_score, "
+                "player2_score, winner_id, games, status, round, bracket_position) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._bracket_rows(tournament["id"], bracket, ids),
+            )
+        return len(bracket.matches)
+
+    @staticmethod
+    def _bracket_rows(tournament_id, bracket, ids):
+        m = bracket.matches
+        columns = zip(range(len(m)), m.player1.tolist(), m.player2.tolist(), m.player1_score.tolist(),
+                      m.player2_score.tolist(), m.winner.tolist(), m.status.tolist(), m.round.tolist(),
+                      m.bracket.tolist(), m.position.tolist())
+        for match_no, p1, p2, s1, s2, winner, status, rnd, section, position in columns:
+            yield (tournament_id, match_no, None if p1 == BYE else ids[p1], None if p2 == BYE else ids[p2],
+                   s1, s2, None if winner == BYE else ids[winner], "[]", STATUS_NAMES[status],
+                   rnd, f"{BRACKET_NAMES[section]}-{rnd}-{position}")
+
+    def update_match(self, tournament_id, match_no, **fields):
+        unknown = set(fields) - set(MATCH_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown match fields: {', '.join(sorted(unknown))}")
+        if "games" in fields:
+            fields["games"] = json.dumps(fields["games"])
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self.db:
+            self.db.execute(f"UPDATE matches SET {assignments} WHERE tournament_id = ? AND match_no = ?",
+                            (*fields.values(), tournament_id, match_no))
+
+    def update_matches(self, rows, fields=MATCH_STATE):
+        # Many match updates in one transaction; each row is a dict with tournament_id, match_no and `fields`
+        unknown = set(fields) - set(MATCH_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown match fields: {', '.join(sorted(unknown))}")
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self.db:
+            self.db.executemany(f"UPDATE matches SET {assignments} WHERE tournament_id = ? AND match_no = ?",
+                                ([*(row[name] for name in fields), row["tournament_id"], row["match_no"]]
+                                 for row in rows))
+        return len(rows)
+
+    # Point and range lookups, all served by an index
+
+    def get_player(self, player_id):
+        row = self.db.execute("SELECT * FROM players WHERE id = ?", (player_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_tournament(self, tournament_id):
+        row = self.db.execute("SELECT * FROM tournaments WHERE id = ?", (tournament_id,)).fetchone()
+        return dict(row) if row else None
+
+    def tournaments_by_status(self, status):
+        return [dict(r) for r in self.db.execute("SELECT * FROM tournaments WHERE status = ?", (status,))]
+
+    def tournament_players(self, tournament_id):
+        rows = self.db.execute("SELECT player_id FROM tournament_players WHERE tournament_id = ?", (tournament_id,))
+        return [r[0] for r in rows]
+
+    def matches(self, tournament_id, round=None, status=None):
+        sql = "SELECT * FROM matches WHERE tournament_id = ?"
+        args = [tournament_id]
+        if round is not None:
+            sql += " AND round = ?"
+            args.append(round)
+        if status is not None:
+            sql += " AND status = ?"
+            args.append(status)
+        return [self._match(r) for r in self.db.execute(sql + " ORDER BY match_no", args)]
+
+    def get_match(self, tournament_id, match_no):
+        row = self.db.execute("SELECT * FROM matches WHERE tournament_id = ? AND match_no = ?",
+                              (tournament_id, match_no)).fetchone()
+        return self._match(row) if row else None
+
+    def player_matches(self, player_id):
+        rows = self.db.execute(
+            "SELECT * FROM matches WHERE player1_id = ? UNION ALL "
+            "SELECT * FROM matches WHERE player2_id = ? AND player1_id IS NOT ?",
+            (player_id, player_id, player_id),
+        )
+        return [self._match(r) for r in rows]
+
+    @staticmethod
+    def _match(row):
+        match = dict(row)
+        match["games"] = json.loads(match["games"] or "[]")
+        return match
+
+
+if __name__ == "__main__":
+    print("SmashScore Tournament Store")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as folder:
+        store = TournamentStore(os.path.join(folder, "archive.db"))
+        players = [{"id": f"player-{i}", "name": f"Player {i}"} for i in range(4096)]
+        store.add_players(players)
+
+        start = time.perf_counter()
+        total = 0
+        events = 0
+        while total < 1000000:
+            bracket = BracketGenerator.generateDoubleElimination(players, seed=events)
+            total += store.add_tournament({"id": f"event-{events}", "name": f"Event {events}",
+                                           "status": "completed"}, bracket)
+            events += 1
+        print(f"Bulk insert: {total} matches in {events} tournaments, {time.perf_counter() - start:.1f} s")
+
+        lookups = (
+            ("get_tournament", lambda i: store.get_tournament(f"event-{i % events}")),
+            ("get_player", lambda i: store.get_player(f"player-{i % 4096}")),
+            ("get_match", lambda i: store.get_match(f"event-{i % events}", i % 8191)),
+            ("matches by round", lambda i: store.matches(f"event-{i % events}", round=5)),
+        )
+        for name, lookup in lookups:
+            start = time.perf_counter()
+            for i in range(1000):
+                lookup(i)
+            elapsed = time.perf_counter() - start
+            print(f"  • {name}: {elapsed / 1000 * 1000:.3f} ms per call")
+        store.close()
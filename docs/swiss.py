@@ -0,0 +1,168 @@
+# Swiss System pairing for a SwissState from bracket_generator.py
+# Players are ranked by standings and paired with an exact min-cost matching restricted to a
+# window of the next `window` players in that order (a banded DP over "already paired" bitmasks).
+# Costs keep pairings inside score groups and make rematches a last resort.
+import time
+
+import numpy as np
+
+import instrument
+from bracket_generator import BYE, COMPLETED, BracketGenerator
+
+SCORE_GAP_COST = 1 << 8
+REMATCH_COST = 1 << 24
+MAX_WINDOW = 12
+
+
+def buchholz(state):
+    # Sum of the current points of every opponent met so far
+    met = state.opponents[:, :state.current_round - 1]
+    return np.where(met >= 0, state.points[met], 0).sum(axis=1)
+
+
+def standings(state):
+    # Player ids ordered by points, then Buchholz, then original seed
+    n = len(state.players)
+    return np.lexsort((np.arange(n), -buchholz(state), -state.points))
+
+
+def choose_bye(state, order):
+    # Lowest ranked player who has not had a bye yet (lowest overall if everyone has)
+    candidates = order[state.byes[order] == state.byes.min()]
+    return candidates[-1]
+
+
+def pair_costs(state, order, window):
+    # costs[i, d - 1]: cost of pairing order[i] with order[i + d]
+    n = len(order)
+    points = state.points[order]
+    played = state.opponents[order]
+    costs = np.full((n, window), REMATCH_COST * 4, dtype=np.int64)
+    for d in range(1, min(window, n - 1) + 1):
+        gap = (points[:-d] - points[d:]).astype(np.int64)
+        rematch = (played[:-d] == order[d:, None]).any(axis=1)
+        costs[:-d, d - 1] = gap * gap * SCORE_GAP_COST + rematch * REMATCH_COST
+    return costs
+
+
+@instrument.traced("swiss.min_cost_pairing")
+def min_cost_pairing(costs):
+    # Banded DP: bit k of the state means position i + k is already paired
+    n, window = costs.shape
+    states = 1 << window
+    masks = np.arange(states)
+    inf = np.iinfo(np.int64).max // 4
+    dp = np.full(states, inf, dtype=np.int64)
+    dp[0] = 0
+    choices = np.zeros((n, states), dtype=np.int8)
+    taken = (masks & 1) == 1
+
+    for i in range(n):
+        new = np.full(states, inf, dtype=np.int64)
+        choice = choices[i]
+        new[masks[taken] >> 1] = dp[taken]
+        for d in range(1, window + 1):
+            if i + d >= n:
+                break
+            source = masks[~taken & ((masks >> d) & 1 == 0)]
+            target = (source | (1 << d)) >> 1
+            candidate = dp[source] + costs[i, d - 1]
+            better = candidate < new[target]
+            new[target[better]] = candidate[better]
+            choice[target[better]] = d
+        dp = new
+
+    # Walk the choices back from the empty final state
+    partner = np.full(n, -1, dtype=np.int64)
+    mask = 0
+    for i in range(n - 1, -1, -1):
+        d = int(choices[i, mask])
+        if d == 0:
+            mask = (mask << 1) | 1
+        else:
+            partner[i] = i + d
+            mask = (mask << 1) & ~(1 << d)
+    return dp[0], partner
+
+
+@instrument.traced("swiss.pair_round")
+def pair_round(state, window=6):
+    # Pair state.current_round, store the matches and return their ids
+    if state.current_round > state.rounds:
+        raise ValueError("All Swiss rounds have already been paired")
+    order = standings(state)
+    bye = BYE
+    if len(order) % 2:
+        bye = choose_bye(state, order)
+        order = order[order != bye]
+
+    while True:
+        costs = pair_costs(state, order, window)
+        total, partner = min_cost_pairing(costs)
+        if total < REMATCH_COST or window >= MAX_WINDOW:
+            break
+        window *= 2
+    instrument.observe("swiss.window", window)
+    instrument.count("swiss.rematches", int(total // REMATCH_COST))
+
+    first = np.flatnonzero(partner >= 0)
+    player1 = order[first]
+    player2 = order[partner[first]]
+    if bye != BYE:
+        player1 = np.append(player1, bye)
+        player2 = np.append(player2, BYE)
+
+    round_index = state.current_round - 1
+    state.opponents[player1, round_index] = player2
+    state.opponents[player2[player2 != BYE], round_index] = player1[player2 != BYE]
+
+    matches = state.matches
+    ids = matches.grow(len(player1))
+    rows = slice(ids.start, ids.stop)
+    matches.player1[rows] = player1
+    matches.player2[rows] = player2
+    matches.round[rows] = state.current_round
+    matches.position[rows] = np.arange(1, len(player1) + 1)
+    if bye != BYE:
+        matches.winner[ids.stop - 1] = bye
+        matches.status[ids.stop - 1] = COMPLETED
+        state.byes[bye] += 1
+        state.points[bye] += 1
+    return ids
+
+
+def record_round(state, match_ids, winners):
+    # Apply one round of results to the standings without replaying earlier rounds. Byes are skipped:
+    # pair_round already completed them and gave the point, so its ids can be passed back unfiltered.
+    match_ids = np.asarray(match_ids, dtype=np.int64)
+    winners = np.asarray(winners, dtype=np.int32)
+    matches = state.matches
+    playable = (matches.status[match_ids] != COMPLETED) & (matches.player2[match_ids] != BYE)
+    match_ids, winners = match_ids[playable], winners[playable]
+    matches.winner[match_ids] = winners
+    matches.status[match_ids] = COMPLETED
+    np.add.at(state.points, winners[winners != BYE], 1)
+    state.current_round += 1
+
+
+if __name__ == "__main__":
+    print("SmashScore Swiss Pairing Benchmark")
+    print("=" * 60)
+    rng = np.random.default_rng(7)
+    for size in (64, 512, 1500):
+        state = BracketGenerator.generateSwiss(list(range(size)))
+        skill = rng.permutation(size)
+        timings = []
+        for _ in range(state.rounds):
+            start = time.perf_counter()
+            ids = pair_round(state)
+            timings.append(time.perf_counter() - start)
+            played = np.array([i for i in ids if state.matches.status[i] != COMPLETED])
+            p1 = state.matches.player1[played]
+            p2 = state.matches.player2[played]
+            record_round(state, played, np.where(skill[p1] > skill[p2], p1, p2))
+
+        pairs = {tuple(sorted(p)) for p in zip(state.matches.player1.tolist(), state.matches.player2.tolist())}
+        rematches = len(state.matches) - len(pairs)
+        print(f"  • {size} players, {state.rounds} rounds: worst round {max(timings) * 1000:.1f} ms, "
+              f"mean {np.mean(timings) * 1000:.1f} ms, rematches {rematches}")
@@ -0,0 +1,278 @@
+# Delta-based bracket state sync
+# A score change touches a handful of matches, so instead of rewriting every tournament (the app's
+# updateTournament rereads, maps and saves the whole `tournaments` array) each change becomes a versioned
+# delta carrying only the fields that changed: {"t": tournament, "v": version, "m": [[match_no, {field: value}]]}.
+# BracketSync holds the current state, produces deltas and merged catch-ups for clients, and applies them
+# on replicas. DeltaLog persists a snapshot plus an append-only delta log per tournament: one update is one
+# appended line, and the log is folded into a fresh snapshot (written atomically) when it grows too long.
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from urllib.parse import quote
+
+import numpy as np
+
+from bracket_generator import BYE, NO_MATCH, STATUS_NAMES, BracketGenerator
+from emit import write_atomic
+from export_stream import player_id
+from scoring import ScoringEngine, simulate_games
+from store import MATCH_STATE
+
+FIELDS = MATCH_STATE
+FIELD_INDEX = {name: i for i, name in enumerate(FIELDS)}
+HISTORY = 1024         # versions kept in memory for catch-ups; older clients get a snapshot
+COMPACT_EVERY = 4096   # logged deltas before the log is folded into a new snapshot
+
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":"))
+
+
+def routed_matches(matches, match_id):
+    # Matches a result can change: the match itself, where its winner and loser go, and onwards through
+    # matches that complete on arrival (byes). Links are static, so this never depends on match state.
+    touched = [match_id]
+    pending = [match_id]
+    while pending:
+        current = pending.pop()
+        for target in (matches.next_match[current], matches.loser_match[current]):
+            if target != NO_MATCH:
+                touched.append(int(target))
+                if matches.entrants[target] == 1:
+                    pending.append(int(target))
+    return touched
+
+
+def state_rows(bracket, ids, match_ids=None):
+    # Match state rows (match_no plus the FIELDS columns) for `match_ids`, or every match;
+    # `ids` maps player indexes to player ids
+    m = bracket.matches
+    rows = np.arange(len(m)) if match_ids is None else np.fromiter(sorted(match_ids), dtype=np.int64)
+
+    def player(index):
+        return None if index == BYE else ids[index]
+
+    columns = zip(rows.tolist(), m.player1[rows].tolist(), m.player2[rows].tolist(),
+                  m.player1_score[rows].tolist(), m.player2_score[rows].tolist(),
+                  m.winner[rows].tolist(), m.status[rows].tolist())
+    return [{"match_no": match_no, "player1_id": player(p1), "player2_id": player(p2),
+             "player1_score": s1, "player2_score": s2, "winner_id": player(winner),
+             "status": STATUS_NAMES[status]}
+            for match_no, p1, p2, s1, s2, winner, status in columns]
+
+
+class BracketSync:
+    def __init__(self, tournament_id, rows=(), version=0, history=HISTORY):
+        self.id = tournament_id
+        self.version = version
+        self.base = version  # oldest version a catch-up can start from
+        self.state = {row["match_no"]: [row[name] for name in FIELDS] for row in rows}
+        self.history = deque()  # (version, changes), newest last
+        self.keep = history
+
+    @classmethod
+    def from_snapshot(cls, snapshot, history=HISTORY):
+        sync = cls(snapshot["t"], version=snapshot["v"], history=history)
+        positions = [FIELD_INDEX[name] for name in snapshot["fields"]]
+        for match_no, *values in snapshot["m"]:
+            state = sync.state.setdefault(match_no, [None] * len(FIELDS))
+            for position, value in zip(positions, values):
+                state[position] = value
+        return sync
+
+    def snapshot(self):
+        return {"t": self.id, "v": self.version, "snapshot": True, "fields": list(FIELDS),
+                "m": [[match_no, *values] for match_no, values in sorted(self.state.items())]}
+
+    def rows(self):
+        return [{"match_no": match_no, **dict(zip(FIELDS, values))} for match_no, values in sorted(self.state.items())]
+
+    def update(self, rows):
+        # New state for some matches -> the next delta with only the changed fields, or None if nothing changed
+        changes = []
+        for row in rows:
+            values = [row[name] for name in FIELDS]
+            old = self.state.get(row["match_no"])
+            changed = (dict(zip(FIELDS, values)) if old is None
+                       else {name: new for name, new, was in zip(FIELDS, values, old) if new != was})
+            if changed:
+                self.state[row["match_no"]] = values
+                changes.append([row["match_no"], changed])
+        if not changes:
+            return None
+        self.version += 1
+        self._remember(self.version, changes)
+        return {"t": self.id, "v": self.version, "m": changes}
+
+    def _remember(self, version, changes):
+        self.history.append((version, changes))
+        while len(self.history) > self.keep:
+            self.base = self.history.popleft()[0]
+
+    def catch_up(self, version):
+        # Smallest payload that brings a client at `version` up to date: the merged changes since then
+        # (latest value per match and field), or a snapshot once those versions have left the history
+        if version > self.version:
+            raise ValueError(f"Version {version} is ahead of {self.id} at {self.version}")
+        if version < self.base:
+            return self.snapshot()
+        merged = {}
+        for logged, changes in reversed(self.history):
+            if logged <= version:
+                break
+            for match_no, changed in changes:
+                fields = merged.setdefault(match_no, {})
+                for name, value in changed.items():
+                    fields.setdefault(name, value)  # newest first, so the first value seen wins
+        return {"t": self.id, "since": version, "v": self.version, "m": sorted(merged.items())}
+
+    def apply(self, delta):
+        # Replica side: apply a delta or a catch-up; returns False when it is already included.
+        # Replicas keep no history of their own, so catch-ups are served from the primary.
+        if delta.get("snapshot"):
+            if delta["v"] < self.version:
+                return False
+            fresh = BracketSync.from_snapshot(delta)
+            self.state, self.version, self.base = fresh.state, fresh.version, fresh.version
+            self.history.clear()
+            return True
+        if delta["v"] <= self.version:
+            return False
+        since = delta.get("since", delta["v"] - 1)
+        if since > self.version:
+            raise ValueError(f"{self.id}: delta {since} -> {delta['v']} does not follow version {self.version}")
+        for match_no, changed in delta["m"]:
+            state = self.state.setdefault(match_no, [None] * len(FIELDS))
+            for name, value in changed.items():
+                state[FIELD_INDEX[name]] = value
+        self.version = self.base = delta["v"]
+        self.history.clear()
+        return True
+
+
+class DeltaLog:
+    # <folder>/<tournament>.snapshot.json (replaced atomically) and <tournament>.log (one encoded delta per line)
+    def __init__(self, folder, compact_every=COMPACT_EVERY):
+        self.folder = folder
+        self.compact_every = compact_every
+        self.files = {}
+        self.logged = {}  # tournament id -> deltas appended since its snapshot
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, tournament_id, suffix):
+        return os.path.join(self.folder, quote(tournament_id, safe="") + suffix)
+
+    def _file(self, tournament_id):
+        log = self.files.get(tournament_id)
+        if log is None:
+            log = self.files[tournament_id] = open(self._path(tournament_id, ".log"), "a", encoding="utf-8")
+        return log
+
+    def append(self, tournament_id, lines):
+        # Encoded deltas, in version order, as one write; returns True once the log is due for compaction
+        log = self._file(tournament_id)
+        log.write("".join(line + "\n" for line in lines))
+        log.flush()
+        self.logged[tournament_id] = self.logged.get(tournament_id, 0) + len(lines)
+        return self.logged[tournament_id] >= self.compact_every
+
+    def write_snapshot(self, tournament_id, snapshot):
+        # Replace the snapshot, then empty the log; a crash in between only leaves deltas load() skips
+        write_atomic(self._path(tournament_id, ".snapshot.json"), encode(snapshot).encode())
+        log = self.files.pop(tournament_id, None)
+        if log is not None:
+            log.close()
+        open(self._path(tournament_id, ".log"), "w").close()
+        self.logged[tournament_id] = 0
+
+    def load(self, tournament_id, history=HISTORY):
+        with open(self._path(tournament_id, ".snapshot.json"), encoding="utf-8") as f:
+            sync = BracketSync.from_snapshot(json.load(f), history)
+        logged = 0
+        try:
+            with open(self._path(tournament_id, ".log"), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        delta = json.loads(line)
+                    except ValueError:
+                        break  # torn final line from an interrupted write
+                    sync.apply(delta)
+                    logged += 1
+        except FileNotFoundError:
+            pass
+        self.logged[tournament_id] = logged
+        return sync
+
+    def close(self):
+        for log in self.files.values():
+            log.close()
+        self.files = {}
+
+
+if __name__ == "__main__":
+    print("SmashScore Delta Sync")
+    print("=" * 60)
+    events, size = 20, 512
+    players = [f"player-{i}" for i in range(size)]
+    brackets = [BracketGenerator.generateDoubleElimination(players, seed=e) for e in range(events)]
+    ids = [player_id(p) for p in players]
+    blob = {f"event-{e}": state_rows(b, ids) for e, b in enumerate(brackets)}
+
+    # Play event 0 live, one game at a time
+    bracket = brackets[0]
+    engine = ScoringEngine(bracket)
+    played = BracketGenerator.generateDoubleElimination(players, seed=0)
+    log_engine = ScoringEngine(played)
+    simulate_games(played, log_engine, np.random.default_rng(0))
+    games = list(zip(log_engine.game_match, log_engine.game_winner))
+
+    with tempfile.TemporaryDirectory() as folder:
+        # Whole-blob rewrite per game, like updateTournament
+        blob_path = os.path.join(folder, "tournaments.json")
+        sample = games[:200]
+        start = time.perf_counter()
+        written = 0
+        for match_id, winner in sample:
+            engine.record_game(match_id, winner)
+            blob["event-0"] = state_rows(bracket, ids)
+            data = json.dumps(blob).encode()
+            write_atomic(blob_path, data)
+            written += len(data)
+        blob_time = (time.perf_counter() - start) / len(sample)
+        print(f"Whole-blob rewrite: {blob_time * 1000:.2f} ms and {written / len(sample) / 1024:.0f} KiB per game "
+              f"({events} events of {len(bracket.matches)} matches)")
+
+        # Deltas: one appended line per game
+        bracket = BracketGenerator.generateDoubleElimination(players, seed=0)
+        engine = ScoringEngine(bracket)
+        primary = BracketSync("event-0", state_rows(bracket, ids))
+        deltas = DeltaLog(os.path.join(folder, "deltas"), compact_every=2000)
+        deltas.write_snapshot("event-0", primary.snapshot())
+        replica = BracketSync.from_snapshot(json.loads(encode(primary.snapshot())))
+        sent = []
+        compactions = 0
+        start = time.perf_counter()
+        for match_id, winner in games:
+            engine.record_game(match_id, winner)
+            delta = primary.update(state_rows(bracket, ids, routed_matches(bracket.matches, match_id)))
+            line = encode(delta)
+            sent.append(len(line))
+            if deltas.append("event-0", [line]):
+                deltas.write_snapshot("event-0", primary.snapshot())
+                compactions += 1
+            if delta["v"] % 3:  # the replica misses every third delta and catches up on the next one
+                replica.apply(json.loads(encode(primary.catch_up(replica.version))))
+        delta_time = (time.perf_counter() - start) / len(games)
+        print(f"Delta log: {delta_time * 1000:.3f} ms and {sum(sent) / len(sent):.0f} bytes per game "
+              f"({len(games)} games, {compactions} compactions)")
+        replica.apply(json.loads(encode(primary.catch_up(replica.version))))
+        behind = primary.version - 100
+        print(f"  • catch-up over the last 100 versions: {len(encode(primary.catch_up(behind)))} bytes, "
+              f"snapshot {len(encode(primary.snapshot()))} bytes")
+        loaded = deltas.load("event-0")
+        deltas.close()
+        final = state_rows(bracket, ids)
+        print(f"  • reloaded from snapshot + log at version {loaded.version}: identical {loaded.rows() == final}")
+        print(f"  • replica at version {replica.version}: identical {replica.rows() == final}")